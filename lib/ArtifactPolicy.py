@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Librairie Robot Framework de politique des artefacts de test du socle Playwright.
+
+Vidéo, trace Playwright et captures d'écran suivent chacun une politique :
+  - off: jamais enregistré
+  - on: toujours enregistré et conservé
+  - retain-on-failure: toujours enregistré, supprimé en fin de scénario réussi
+  - on-first-retry: enregistré et conservé uniquement quand le scénario rejoue un échec
+    (dernière exécution en échec dans les audits NDJSON, voir TestScheduler.load_history)
+
+Les artefacts d'un scénario sont écrits dans `<OUTPUT_DIR>/artifacts/<scénario>/`.
+En fin de scénario (hook after_test, via `web_socle.Liberer Le Navigateur`), les artefacts
+que la politique ne conserve pas sont supprimés ; les autres sont archivés en zip en
+arrière-plan (un seul thread) pour ne pas retarder le scénario suivant.
+
+Variables d'environnement (voir aussi les settings artifacts_* de web_socle.resource) :
+  - ARTIFACTS_VIDEO: politique des vidéos (défaut: retain-on-failure)
+  - ARTIFACTS_TRACE: politique des traces Playwright (défaut: off)
+  - ARTIFACTS_SCREENSHOT: politique des captures d'écran (défaut: on)
+  - ARTIFACTS_COMPRESS: archive en zip les artefacts conservés (défaut: true)
+"""
+
+import atexit
+import hashlib
+import os
+import re
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from robot.api import logger
+from robot.libraries.BuiltIn import BuiltIn
+
+from LibraryUtils import atomic_path, to_bool
+from TestScheduler import load_history
+
+OFF = 'off'
+ON = 'on'
+RETAIN_ON_FAILURE = 'retain-on-failure'
+ON_FIRST_RETRY = 'on-first-retry'
+POLICIES = (OFF, ON, RETAIN_ON_FAILURE, ON_FIRST_RETRY)
+
+# Archivage des artefacts conservés : un seul thread, attendu en fin de processus
+_ARCHIVER = ThreadPoolExecutor(max_workers=1, thread_name_prefix='artifacts')
+atexit.register(_ARCHIVER.shutdown, wait=True)
+
+
+def _policy(value, default: str) -> str:
+    # en YAML, off / on non quotés sont lus comme des booléens, transmis au socle en texte ('False' / 'True')
+    if isinstance(value, bool):
+        value = ON if value else OFF
+    policy = str(value if value not in (None, '') else default).strip().lower()
+    policy = {'true': ON, 'false': OFF}.get(policy, policy)
+    if policy not in POLICIES:
+        raise ValueError(f"Politique d'artefacts '{value}' inconnue, attendu : {', '.join(POLICIES)}")
+    return policy
+
+
+def archive_directory(directory: str) -> str:
+    """Archive le répertoire en `<répertoire>.zip` puis le supprime. Retourne le chemin de l'archive."""
+    archive = f"{directory}.zip"
+    with atomic_path(archive) as temp_path:
+        with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as stream:
+            for root, _, files in os.walk(directory):
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    stream.write(path, os.path.relpath(path, directory))
+    shutil.rmtree(directory, ignore_errors=True)
+    return archive
+
+
+class ArtifactPolicy:
+    """Politique d'enregistrement et de conservation des vidéos, traces et captures d'écran.
+
+    Options:
+      - video: politique des vidéos (défaut: ARTIFACTS_VIDEO, sinon retain-on-failure)
+      - trace: politique des traces Playwright (défaut: ARTIFACTS_TRACE, sinon off)
+      - screenshot: politique des captures d'écran (défaut: ARTIFACTS_SCREENSHOT, sinon on)
+      - compress: archive en zip les artefacts conservés (défaut: ARTIFACTS_COMPRESS, sinon true)
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    def __init__(self, video=None, trace=None, screenshot=None, compress=None):
+        self.policies = {
+            'video': _policy(video if video is not None else os.environ.get('ARTIFACTS_VIDEO'), RETAIN_ON_FAILURE),
+            'trace': _policy(trace if trace is not None else os.environ.get('ARTIFACTS_TRACE'), OFF),
+            'screenshot': _policy(screenshot if screenshot is not None else os.environ.get('ARTIFACTS_SCREENSHOT'), ON),
+        }
+        self.compress = to_bool(compress if compress is not None else os.environ.get('ARTIFACTS_COMPRESS', 'true'))
+        self._history = None
+        self._recorded = set()
+
+    def _test_key(self) -> tuple:
+        builtin = BuiltIn()
+        suite = builtin.get_variable_value('${SUITE NAME}', '')
+        test = builtin.get_variable_value('${TEST NAME}', '')
+        # même clé que les audits de ReporterLibrary : (dernière suite parente, nom du test)
+        parts = [part.strip() for part in suite.split('.') if part.strip()]
+        return (parts[-1] if parts else '', test), f"{suite}.{test}"
+
+    def _test_directory(self) -> str:
+        _, longname = self._test_key()
+        slug = re.sub(r'[^\w-]+', '_', longname.rsplit('.', 1)[-1]).strip('_')[:40]
+        digest = hashlib.sha1(longname.encode('utf-8')).hexdigest()[:8]
+        output_dir = BuiltIn().get_variable_value('${OUTPUT DIR}', '.')
+        return os.path.join(output_dir, 'artifacts', f"{slug}-{digest}")
+
+    @staticmethod
+    def _artifact_paths(directory: str, kind: str) -> list:
+        if not os.path.isdir(directory):
+            return []
+        if kind == 'video':
+            return [os.path.join(directory, 'videos')]
+        if kind == 'trace':
+            return [os.path.join(directory, 'trace.zip')]
+        return [os.path.join(directory, name) for name in os.listdir(directory) if name.startswith('screenshot-')]
+
+    def _is_retry(self) -> bool:
+        if self._history is None:
+            # chargé une seule fois par processus, seulement si une politique on-first-retry est utilisée
+            self._history = load_history()
+        key, _ = self._test_key()
+        return self._history.get(key, ((), None))[1] == 'FAIL'
+
+    def _records(self, kind: str) -> bool:
+        policy = self.policies[kind]
+        if policy == OFF:
+            return False
+        if policy == ON_FIRST_RETRY:
+            return self._is_retry()
+        return True
+
+    def get_context_artifact_options(self) -> dict:
+        """Retourne les options d'enregistrement du nouveau contexte Playwright (recordVideo, tracing).
+
+        Examples:
+        | ${artefacts}= | Get Context Artifact Options |
+        | Browser.New Context | &{artefacts} |
+        """
+        options = {}
+        directory = self._test_directory()
+        if self._records('video'):
+            options['recordVideo'] = {'dir': os.path.join(directory, 'videos')}
+        if self._records('trace'):
+            options['tracing'] = os.path.join(directory, 'trace.zip')
+        if options:
+            os.makedirs(directory, exist_ok=True)
+            self._recorded.add(directory)
+        return options
+
+    def artifacts_recorded(self) -> bool:
+        """Retourne True si le scénario en cours a des artefacts à traiter en fin de scénario (vidéo, trace, capture)."""
+        return self._test_directory() in self._recorded
+
+    def screenshot_enabled(self) -> bool:
+        """Retourne True si la politique autorise les captures d'écran pour le scénario en cours."""
+        return self._records('screenshot')
+
+    def get_screenshot_filename(self):
+        """Retourne le fichier de la capture d'écran, ou None pour la capture intégrée au log (politique on).
+
+        Avec retain-on-failure et on-first-retry, la capture est écrite dans le répertoire
+        d'artefacts du scénario pour suivre sa conservation.
+        """
+        if self.policies['screenshot'] == ON:
+            return None
+        directory = self._test_directory()
+        os.makedirs(directory, exist_ok=True)
+        self._recorded.add(directory)
+        return os.path.join(directory, 'screenshot-{index}')
+
+    def finalize_test_artifacts(self, status='PASS'):
+        """Applique la politique aux artefacts du scénario terminé (à appeler après la fermeture du contexte).
+
+        Les artefacts non conservés sont supprimés ; les autres sont archivés en arrière-plan.
+        Retourne le chemin des artefacts conservés, sinon None.
+
+        Examples:
+        | Finalize Test Artifacts | ${TEST STATUS} |
+        """
+        directory = self._test_directory()
+        if directory not in self._recorded:
+            return None
+        self._recorded.discard(directory)
+
+        # seul retain-on-failure dépend du statut : on et on-first-retry conservent ce qui a été enregistré
+        failed = str(status).upper() == 'FAIL'
+        for kind, policy in self.policies.items():
+            if policy == RETAIN_ON_FAILURE and not failed:
+                for path in self._artifact_paths(directory, kind):
+                    if os.path.isdir(path):
+                        shutil.rmtree(path, ignore_errors=True)
+                    elif os.path.exists(path):
+                        os.remove(path)
+        if not any(files for _, _, files in os.walk(directory)):
+            shutil.rmtree(directory, ignore_errors=True)
+            return None
+        if self.compress:
+            _ARCHIVER.submit(archive_directory, directory)
+            directory = f"{directory}.zip"
+        logger.info(f"Artefacts du scénario conservés : {directory}")
+        return directory
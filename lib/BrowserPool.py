@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Librairie Robot Framework de suivi du pool de navigateurs de `web_socle`.
+
+En mode pool, le navigateur d'un worker reste ouvert d'un scénario à l'autre :
+chaque scénario obtient un contexte neuf (Playwright) ou une session nettoyée
+(Selenium : cookies et stockage effacés). Le navigateur est recyclé (fermé puis
+relancé) après `max_reuse` scénarios ou après un scénario en échec.
+
+Cette librairie ne pilote pas le navigateur : elle indique aux mots-clés de
+`web_socle` s'il faut réutiliser, lancer ou recycler le navigateur.
+
+Variables d'environnement :
+  - BROWSER_POOL: active le mode pool (défaut: false, voir `start.bat --pool`)
+  - BROWSER_POOL_MAX_REUSE: nombre de scénarios par navigateur avant recyclage (défaut: 20)
+"""
+
+import os
+
+from LibraryUtils import to_bool
+
+REUSE = 'reuse'
+NEW = 'new'
+RECYCLE = 'recycle'
+
+
+class BrowserPool:
+    """Décide de la réutilisation du navigateur du worker d'un scénario à l'autre.
+
+    Options:
+      - enabled: active le mode pool (défaut: variable d'environnement BROWSER_POOL, sinon false)
+      - max_reuse: scénarios par navigateur avant recyclage (défaut: BROWSER_POOL_MAX_REUSE, sinon 20)
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    def __init__(self, enabled=None, max_reuse=None):
+        self.enabled = to_bool(enabled if enabled is not None else os.environ.get('BROWSER_POOL', 'false'))
+        self.max_reuse = max(1, int(max_reuse if max_reuse is not None
+                                    else os.environ.get('BROWSER_POOL_MAX_REUSE', 20)))
+        self._warm = False
+        self._in_use = False
+        self._uses = 0
+        self._recycle = False
+        self._stats = {'launches': 0, 'reuses': 0, 'recycles': 0}
+
+    def browser_pool_enabled(self) -> bool:
+        """Retourne True si le mode pool est actif."""
+        return self.enabled
+
+    def acquire_pooled_browser(self) -> str:
+        """Retourne l'action à effectuer pour le scénario : `reuse`, `new` ou `recycle`.
+
+        - `reuse`: réutiliser le navigateur ouvert (nouveau contexte / session nettoyée)
+        - `new`: lancer un navigateur (toujours le cas hors mode pool)
+        - `recycle`: fermer le navigateur courant puis en lancer un nouveau
+
+        Examples:
+        | ${action}= | Acquire Pooled Browser |
+        """
+        if not self.enabled or not self._warm:
+            action = NEW
+        elif self._recycle or self._uses >= self.max_reuse:
+            action = RECYCLE
+        else:
+            action = REUSE
+
+        if action == REUSE:
+            self._stats['reuses'] += 1
+        else:
+            self._stats['launches'] += 1
+            self._stats['recycles'] += action == RECYCLE
+            self._uses = 0
+            self._recycle = False
+        self._uses += 1
+        self._warm = self._in_use = True
+        return action
+
+    def release_pooled_browser(self, failed=False) -> bool:
+        """Libère le navigateur à la fin du scénario.
+
+        Retourne True si le navigateur reste dans le pool et doit être nettoyé
+        (mode pool, navigateur ouvert par ce scénario, scénario réussi).
+        Un scénario en échec entraîne le recyclage du navigateur.
+
+        Examples:
+        | ${a_nettoyer}= | Release Pooled Browser | failed=${TRUE} |
+        """
+        acquired, self._in_use = self._in_use, False
+        if not (self.enabled and acquired):
+            return False
+        if to_bool(failed):
+            self._recycle = True
+            return False
+        return True
+
+    def recycle_pooled_browser(self):
+        """Demande le recyclage du navigateur au prochain scénario (ex: nettoyage en échec)."""
+        self._recycle = True
+
+    def reset_browser_pool(self):
+        """Vide le pool : à appeler quand tous les navigateurs sont fermés."""
+        self._warm = self._in_use = self._recycle = False
+        self._uses = 0
+
+    def get_browser_pool_stats(self) -> dict:
+        """Retourne les compteurs du pool : launches, reuses, recycles."""
+        return dict(self._stats)
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Parser Robot Framework des fichiers .feature avec cache de compilation.
+
+Remplace `--parser GherkinParser` : chaque feature est analysée par GherkinParser
+(traduction des mots-clés Gherkin, expansion des `Plan du Scénario` / `Exemples`,
+imports des resources de steps), puis la suite Robot obtenue est enregistrée dans
+WORKSPACE. Aux exécutions suivantes, une feature inchangée est rechargée depuis le
+cache (TestSuite.from_dict) sans être ré-analysée ; seules les features modifiées
+le sont.
+
+Clé du cache d'une feature :
+  - empreinte SHA-256 de son contenu
+  - versions de GherkinParser, de Robot Framework et du format du cache
+  - liste des fichiers .resource importés automatiquement (répertoire de la feature)
+  - valeurs par défaut héritées des fichiers __init__ (tags, setup, teardown, timeout)
+
+Un rapport des temps (analyse vs chargement depuis le cache) est écrit en fin de
+processus dans WORKSPACE/feature_cache_report.json.
+
+Usage :
+    robot --parser lib/CachedGherkinParser.py ... features
+    python lib/CachedGherkinParser.py features        # construit la suite et affiche le rapport
+
+Variables d'environnement :
+  - FEATURE_CACHE: active le cache (défaut: true ; false = comportement de GherkinParser)
+  - FEATURE_CACHE_DIR: répertoire du cache (défaut: WORKSPACE/.feature_cache), partagé par les workers parallèles
+"""
+
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from GherkinParser.__version__ import __version__ as GHERKIN_PARSER_VERSION
+from GherkinParser.gherkin_builder import build_gherkin_model
+from GherkinParser.glob_path import iter_files
+from robot.api.interfaces import Parser
+from robot.running import TestSuite
+from robot.running.builder.settings import FileSettings
+from robot.running.builder.transformers import SuiteBuilder
+from robot.version import get_version
+
+from LibraryUtils import atomic_path, to_bool
+
+# À incrémenter si le contenu enregistré change de forme
+CACHE_FORMAT = 1
+REPORT_FILE = 'feature_cache_report.json'
+
+
+class CachedGherkinParser(Parser):
+    """Parser GherkinParser avec cache des suites compilées par feature.
+
+    Options (robot --parser lib/CachedGherkinParser.py:<cache_dir>:<enabled>) :
+      - cache_dir: répertoire du cache (défaut: FEATURE_CACHE_DIR, sinon WORKSPACE/.feature_cache)
+      - enabled: active le cache (défaut: FEATURE_CACHE, sinon true)
+    """
+
+    extension = ['.feature', '.feature.md']
+
+    def __init__(self, cache_dir=None, enabled=None):
+        self.cache_dir = cache_dir or os.environ.get('FEATURE_CACHE_DIR') or os.path.join(
+            os.environ.get('WORKSPACE', '.'), '.feature_cache')
+        self.enabled = to_bool(enabled if enabled is not None else os.environ.get('FEATURE_CACHE', 'true'))
+        self.version = f"{CACHE_FORMAT}:{GHERKIN_PARSER_VERSION}:{get_version()}"
+        # les resources importées par GherkinParser ne dépendent que du répertoire de la feature
+        self._resources = {}
+        self.stats = {'hits': 0, 'misses': 0, 'load_s': 0.0, 'parse_s': 0.0, 'write_s': 0.0, 'parsed': []}
+        atexit.register(self.write_report)
+
+    def _resource_list(self, directory: Path) -> list:
+        if directory not in self._resources:
+            self._resources[directory] = sorted(
+                str(f.relative_to(directory).as_posix()) for f in iter_files(directory, "**/*.resource")
+                if not f.stem.startswith(("_", ".")))
+        return self._resources[directory]
+
+    def _cache_key(self, source: Path, content: bytes, defaults) -> str:
+        digest = hashlib.sha256(content)
+        settings = {
+            'version': self.version,
+            'suffix': source.suffix,
+            'resources': self._resource_list(source.parent),
+            'tags': list(defaults.tags),
+            'setup': defaults.setup,
+            'teardown': defaults.teardown,
+            'timeout': defaults.timeout,
+        }
+        digest.update(json.dumps(settings, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _cache_path(self, source: Path) -> str:
+        name = hashlib.sha1(str(source).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{source.stem}_{name}.json")
+
+    def _build(self, source: Path, defaults):
+        """Analyse la feature comme GherkinParser. Retourne (suite, analyse réussie)."""
+        start = time.perf_counter()
+        model, name = build_gherkin_model(source)
+        suite = TestSuite(name=name or "", source=source)
+        SuiteBuilder(suite, FileSettings(defaults)).build(model)
+        self.stats['parse_s'] += time.perf_counter() - start
+        self.stats['misses'] += 1
+        self.stats['parsed'].append(str(source))
+        # GherkinParser retourne un nom None si la feature est invalide
+        return suite, name is not None
+
+    def parse(self, source: Path, defaults) -> TestSuite:
+        source = Path(source).resolve()
+        if not self.enabled:
+            return self._build(source, defaults)[0]
+
+        start = time.perf_counter()
+        key = self._cache_key(source, source.read_bytes(), defaults)
+        path = self._cache_path(source)
+        try:
+            with open(path, encoding='utf-8') as stream:
+                entry = json.load(stream)
+            if entry.get('key') == key:
+                suite = TestSuite.from_dict(entry['suite'])
+                self.stats['hits'] += 1
+                self.stats['load_s'] += time.perf_counter() - start
+                return suite
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        suite, valid = self._build(source, defaults)
+        if valid:
+            start = time.perf_counter()
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # plusieurs workers peuvent compiler la même feature
+            with atomic_path(path) as temp_path:
+                with open(temp_path, 'w', encoding='utf-8') as stream:
+                    json.dump({'key': key, 'source': str(source), 'suite': suite.to_dict()}, stream)
+            self.stats['write_s'] += time.perf_counter() - start
+        return suite
+
+    def get_report(self) -> dict:
+        """Retourne le rapport des temps : features chargées du cache vs analysées."""
+        stats = self.stats
+        return {
+            'features': stats['hits'] + stats['misses'],
+            'cache_hits': stats['hits'],
+            'parsed': stats['misses'],
+            'cache_load_ms': round(stats['load_s'] * 1000, 1),
+            'parse_ms': round(stats['parse_s'] * 1000, 1),
+            'cache_write_ms': round(stats['write_s'] * 1000, 1),
+            'parsed_features': stats['parsed'],
+            'cache_enabled': self.enabled,
+            'cache_dir': self.cache_dir,
+        }
+
+    def write_report(self):
+        """Écrit le rapport des temps dans WORKSPACE (si des features ont été lues)."""
+        if not self.stats['hits'] + self.stats['misses']:
+            return None
+        path = os.path.join(os.environ.get('WORKSPACE', '.'), REPORT_FILE)
+        try:
+            with open(path, 'w', encoding='utf-8') as stream:
+                json.dump(self.get_report(), stream, indent=2, ensure_ascii=False)
+        except OSError:
+            return None
+        return path
+
+
+def main(argv=None) -> int:
+    from robot.api import TestSuiteBuilder
+
+    parser = argparse.ArgumentParser(description="Construit la suite des features avec le cache de compilation")
+    parser.add_argument('paths', nargs='+', help="répertoires ou fichiers de features")
+    parser.add_argument('--language', default='fr')
+    parser.add_argument('--no-cache', action='store_true', help="analyse toutes les features (référence)")
+    parser.add_argument('--clear', action='store_true', help="vide le cache avant la construction")
+    args = parser.parse_args(argv)
+
+    cached_parser = CachedGherkinParser(enabled=not args.no_cache)
+    if args.clear and os.path.isdir(cached_parser.cache_dir):
+        for name in os.listdir(cached_parser.cache_dir):
+            os.remove(os.path.join(cached_parser.cache_dir, name))
+
+    start = time.perf_counter()
+    suite = TestSuiteBuilder(custom_parsers=[cached_parser], lang=args.language).build(*args.paths)
+    elapsed = time.perf_counter() - start
+
+    report = cached_parser.get_report()
+    print(f"Suite construite en {elapsed * 1000:.0f} ms : {suite.test_count} test(s), {report['features']} feature(s)")
+    print(f"  cache      : {report['cache_hits']} feature(s) chargée(s) en {report['cache_load_ms']:.0f} ms")
+    print(f"  analyse    : {report['parsed']} feature(s) analysée(s) en {report['parse_ms']:.0f} ms"
+          f" (+ {report['cache_write_ms']:.0f} ms d'écriture du cache)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+Librairie Robot Framework de réservation exclusive des jeux de données (baux).
+
+Lors d'une exécution en parallèle (un worker par processus), deux scénarios ne
+doivent pas utiliser le même compte utilisateur ou le même dossier. Chaque
+worker réserve un élément du jeu de données dans un pool partagé (base SQLite
+dans WORKSPACE), puis le libère à la fin du test (hook `after_test`).
+
+Un bail est repris automatiquement :
+  - s'il a expiré (durée `ttl`, protège contre un worker bloqué)
+  - si le processus qui le détient n'existe plus (worker tué, même machine)
+
+Variables d'environnement :
+  - DATA_LEASE_DB: chemin de la base (défaut: WORKSPACE/data_leases.sqlite)
+  - DATA_LEASE_TIMEOUT: attente maximale quand le pool est épuisé, en secondes (défaut: 60, 0 = échec immédiat)
+  - DATA_LEASE_TTL: durée de vie d'un bail, en secondes (défaut: 1800)
+  - DATA_LEASE_WAL: journal WAL de la base (défaut: false ; à éviter sur un partage réseau, ex: NFS)
+
+La base n'est créée qu'à la première réservation : une exécution sans bail n'en laisse aucune.
+"""
+
+import atexit
+import os
+import socket
+import sqlite3
+import time
+from contextlib import closing
+
+from DatasetLibrary import DEFAULT_DATASET_DIR, load_dataset
+from LibraryUtils import to_bool
+
+# Intervalle entre deux tentatives quand le pool est épuisé (secondes)
+POLL_INTERVAL = 0.2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    resource    TEXT PRIMARY KEY,
+    owner       TEXT NOT NULL,
+    host        TEXT NOT NULL,
+    pid         INTEGER NOT NULL,
+    acquired_at REAL NOT NULL,
+    expires_at  REAL NOT NULL
+)
+"""
+
+
+def _pid_alive(pid: int) -> bool:
+    """Indique si le processus `pid` existe encore sur cette machine."""
+    if os.name == 'nt':
+        # os.kill(pid, 0) termine le processus sous Windows : passer par l'API Win32
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        kernel32.CloseHandle(handle)
+        return exit_code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class DataLeaseLibrary:
+    """Réservation exclusive d'utilisateurs et de dossiers du jeu de données entre workers.
+
+    Options:
+      - environment: environnement du jeu de données (défaut: variable d'environnement MY_ENV)
+      - dataset_dir: répertoire des fichiers `<ENV>_dataset.yaml` (défaut: `dataset/` du projet)
+      - database: base SQLite des baux (défaut: DATA_LEASE_DB, sinon WORKSPACE/data_leases.sqlite)
+      - timeout: attente maximale d'un élément libre en secondes (défaut: DATA_LEASE_TIMEOUT, sinon 60)
+      - ttl: durée de vie d'un bail en secondes (défaut: DATA_LEASE_TTL, sinon 1800)
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    DEFAULT_COLLECTION = 'utilisateurs'
+    # Clé identifiant un élément de chaque collection dans le pool
+    IDENTITY_KEYS = {'utilisateurs': 'email', 'DEMARCHES': 'numero'}
+
+    def __init__(self, environment=None, dataset_dir=None, database=None, timeout=None, ttl=None):
+        environment = environment or os.environ.get('MY_ENV')
+        if not environment:
+            raise ValueError("Environnement du jeu de données non défini (argument 'environment' ou MY_ENV)")
+        self.environment = environment
+        self._dataset = load_dataset(os.path.join(dataset_dir or DEFAULT_DATASET_DIR, f"{environment}_dataset.yaml"))
+
+        self.database = database or os.environ.get('DATA_LEASE_DB') or os.path.join(
+            os.environ.get('WORKSPACE', '.'), 'data_leases.sqlite')
+        self.timeout = float(timeout if timeout is not None else os.environ.get('DATA_LEASE_TIMEOUT', 60))
+        self.ttl = float(ttl if ttl is not None else os.environ.get('DATA_LEASE_TTL', 1800))
+
+        self.host = socket.gethostname()
+        self.pid = os.getpid()
+        self.owner = f"{self.host}:{self.pid}"
+        self.wal = to_bool(os.environ.get('DATA_LEASE_WAL'))
+        self._held = set()
+        self._initialized = False
+
+    def _initialize(self):
+        """Crée la base au premier besoin et enregistre la libération des baux en fin de processus."""
+        if self._initialized:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.database)), exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute(_SCHEMA)
+        atexit.register(self.release_data_leases)
+        self._initialized = True
+
+    def _connect(self):
+        # isolation_level=None : transactions explicites (BEGIN IMMEDIATE) pour verrouiller la base
+        connection = sqlite3.connect(self.database, timeout=30, isolation_level=None)
+        if self.wal:
+            connection.execute('PRAGMA journal_mode=WAL')
+        return connection
+
+    def _resource(self, collection, identity):
+        return f"{self.environment}:{collection}:{identity}"
+
+    def _identity_key(self, collection, identity_key=None):
+        """Clé identifiant un élément de la collection : `identity_key`, sinon celle de IDENTITY_KEYS."""
+        identity_key = identity_key or self.IDENTITY_KEYS.get(collection)
+        if not identity_key:
+            raise ValueError(f"Clé d'identité inconnue pour la collection '{collection}' "
+                             f"(argument 'identity_key' requis, connues : {', '.join(self.IDENTITY_KEYS)})")
+        return identity_key
+
+    def _purge(self, connection, now):
+        """Supprime les baux expirés ou détenus par un processus disparu de cette machine."""
+        connection.execute('DELETE FROM leases WHERE expires_at < ?', (now,))
+        rows = connection.execute('SELECT resource, pid FROM leases WHERE host = ? AND pid != ?',
+                                  (self.host, self.pid)).fetchall()
+        for resource, pid in rows:
+            if not _pid_alive(pid):
+                connection.execute('DELETE FROM leases WHERE resource = ?', (resource,))
+
+    def _try_acquire(self, resources):
+        """Réserve la première ressource libre de la liste (ordre du jeu de données), sinon None."""
+        connection = self._connect()
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            now = time.time()
+            self._purge(connection, now)
+            taken = {row[0] for row in connection.execute('SELECT resource FROM leases')}
+            for resource in resources:
+                if resource not in taken:
+                    connection.execute('INSERT INTO leases VALUES (?, ?, ?, ?, ?, ?)',
+                                       (resource, self.owner, self.host, self.pid, now, now + self.ttl))
+                    connection.execute('COMMIT')
+                    self._held.add(resource)
+                    return resource
+            connection.execute('COMMIT')
+            return None
+        except BaseException:
+            # BEGIN IMMEDIATE peut lui-même échouer (base verrouillée) : rien à annuler
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            raise
+        finally:
+            connection.close()
+
+    def _acquire(self, candidates, timeout, description):
+        """Attend qu'un des candidats `{ressource: élément}` soit libre et le réserve."""
+        if not candidates:
+            raise AssertionError(f"Aucun élément trouvé pour {description}")
+        self._initialize()
+        timeout = self.timeout if timeout is None else float(timeout)
+        deadline = time.monotonic() + timeout
+        while True:
+            resource = self._try_acquire(list(candidates))
+            if resource is not None:
+                return candidates[resource]
+            if time.monotonic() >= deadline:
+                raise AssertionError(f"Pool épuisé : aucun élément libre pour {description} "
+                                     f"({len(candidates)} réservé(s) par d'autres workers, attente {timeout:g}s)")
+            time.sleep(POLL_INTERVAL)
+
+    def acquire_dataset_item(self, key, value, collection=DEFAULT_COLLECTION, timeout=None, identity_key=None):
+        """Réserve un élément libre de la collection dont `key` vaut `value` et le retourne.
+
+        Attend au plus `timeout` secondes qu'un élément se libère (0 = échec immédiat).
+        L'élément reste réservé jusqu'à `Release Data Lease` / `Release Data Leases`.
+        `identity_key` (clé unique d'un élément) est requis pour une collection absente de IDENTITY_KEYS.
+
+        Examples:
+        | ${user}= | Acquire Dataset Item | profile | usager |
+        | ${user}= | Acquire Dataset Item | profile | instructeur | timeout=0 |
+        """
+        identity_key = self._identity_key(collection, identity_key)
+        candidates = {}
+        for item in self._dataset.index(collection, key).get(str(value), ()):
+            candidates.setdefault(self._resource(collection, item.get(identity_key)), item)
+        return self._acquire(candidates, timeout, f"'{collection}' avec {key}=\"{value}\"")
+
+    def acquire_dossier(self, demarche, kind='dossiers', timeout=None):
+        """Réserve un dossier libre de la démarche `demarche` (numéro) et retourne son numéro.
+
+        `kind` désigne la liste de dossiers de la démarche (`dossiers`, `dossiers_instructeur`).
+
+        Examples:
+        | ${dossier}= | Acquire Dossier | 1919 |
+        | ${dossier}= | Acquire Dossier | 1919 | kind=dossiers_instructeur |
+        """
+        demarches = self._dataset.index('DEMARCHES', 'numero').get(str(demarche))
+        if not demarches:
+            raise AssertionError(f"Démarche '{demarche}' absente du jeu de données")
+        candidates = {}
+        for dossier in demarches[0].get(kind) or ():
+            numero = dossier.get('numero') if isinstance(dossier, dict) else dossier
+            candidates.setdefault(self._resource(f"DEMARCHES:{demarche}:{kind}", numero), numero)
+        return self._acquire(candidates, timeout, f"la démarche {demarche} ({kind})")
+
+    def release_data_lease(self, item, collection=DEFAULT_COLLECTION, identity_key=None):
+        """Libère le bail d'un élément retourné par `Acquire Dataset Item` (mêmes `collection` et `identity_key`).
+
+        Examples:
+        | Release Data Lease | ${user} |
+        """
+        identity = item.get(self._identity_key(collection, identity_key))
+        self._release([self._resource(collection, identity)])
+
+    def release_data_leases(self):
+        """Libère tous les baux détenus par ce processus (à appeler dans le hook `after_test`)."""
+        self._release(list(self._held))
+
+    def _release(self, resources):
+        resources = [r for r in resources if r in self._held]
+        if not resources:
+            return
+        with closing(self._connect()) as connection:
+            connection.executemany('DELETE FROM leases WHERE resource = ? AND owner = ?',
+                                   [(resource, self.owner) for resource in resources])
+        self._held.difference_update(resources)
+
+    def get_data_leases(self):
+        """Retourne les baux en cours de tous les workers (liste de dictionnaires), pour diagnostic."""
+        if not os.path.isfile(self.database):
+            return []
+        with closing(self._connect()) as connection:
+            rows = connection.execute('SELECT resource, owner, acquired_at, expires_at FROM leases '
+                                      'ORDER BY acquired_at').fetchall()
+        return [dict(zip(('resource', 'owner', 'acquired_at', 'expires_at'), row)) for row in rows]
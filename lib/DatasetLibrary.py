@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Librairie Robot Framework d'accès indexé aux jeux de données YAML.
+
+Le fichier `dataset/<ENV>_dataset.yaml` est chargé une seule fois par processus,
+puis chaque collection (par exemple `utilisateurs`) est indexée par clé
+(profile, role, email et toute clé déclarée) : une recherche est un accès
+dictionnaire au lieu d'une boucle FOR Robot sur toute la liste.
+"""
+
+import os
+import random
+import threading
+
+from YamlVariables import load_yaml, to_dot_dict
+
+# Répertoire des jeux de données par défaut : <racine du projet>/dataset
+DEFAULT_DATASET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dataset')
+
+# Jeux de données chargés, partagés par toutes les instances du processus : chemin -> _Dataset
+_DATASETS = {}
+_DATASETS_LOCK = threading.Lock()
+
+
+class _Dataset:
+    """Contenu d'un fichier de jeu de données et ses index (collection, clé) -> valeur -> éléments."""
+
+    def __init__(self, path, data):
+        self.path = path
+        self.data = data
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def collection(self, name):
+        items = self.data.get(name)
+        if not isinstance(items, list):
+            raise ValueError(f"Collection '{name}' absente ou invalide dans le jeu de données {self.path}")
+        return items
+
+    def index(self, collection, key):
+        """Retourne l'index {valeur: [éléments]} d'une clé, construit au premier appel."""
+        index = self._indexes.get((collection, key))
+        if index is None:
+            with self._lock:
+                index = self._indexes.get((collection, key))
+                if index is None:
+                    index = {}
+                    for item in self.collection(collection):
+                        if isinstance(item, dict) and key in item:
+                            index.setdefault(str(item[key]), []).append(item)
+                    self._indexes[(collection, key)] = index
+        return index
+
+
+def load_dataset(path):
+    """Charge (une seule fois par processus) le jeu de données YAML du chemin donné."""
+    path = os.path.abspath(path)
+    with _DATASETS_LOCK:
+        dataset = _DATASETS.get(path)
+        if dataset is None:
+            dataset = _Dataset(path, to_dot_dict(load_yaml(path)))
+            _DATASETS[path] = dataset
+        return dataset
+
+
+class DatasetLibrary:
+    """Recherche indexée dans les jeux de données YAML.
+
+    Options:
+      - environment: environnement du jeu de données (défaut: variable d'environnement MY_ENV)
+      - dataset_dir: répertoire des fichiers `<ENV>_dataset.yaml` (défaut: `dataset/` du projet)
+      - index_keys: clés indexées dès le chargement, séparées par des virgules
+        (défaut: profile, role, email ; toute autre clé est indexée à sa première utilisation)
+      - seed: graine du tirage aléatoire (défaut: variable d'environnement DATASET_SEED, sinon 0)
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    DEFAULT_COLLECTION = 'utilisateurs'
+    DEFAULT_INDEX_KEYS = ('profile', 'role', 'email')
+
+    def __init__(self, environment=None, dataset_dir=None, index_keys=None, seed=None):
+        environment = environment or os.environ.get('MY_ENV')
+        if not environment:
+            raise ValueError("Environnement du jeu de données non défini (argument 'environment' ou MY_ENV)")
+        self.dataset_path = os.path.join(dataset_dir or DEFAULT_DATASET_DIR, f"{environment}_dataset.yaml")
+        self._dataset = load_dataset(self.dataset_path)
+
+        keys = self.DEFAULT_INDEX_KEYS
+        if index_keys:
+            keys += tuple(k.strip() for k in str(index_keys).split(',') if k.strip())
+        if isinstance(self._dataset.data.get(self.DEFAULT_COLLECTION), list):
+            for key in keys:
+                self._dataset.index(self.DEFAULT_COLLECTION, key)
+
+        self._cursors = {}
+        self._random = random.Random(seed if seed is not None else os.environ.get('DATASET_SEED', '0'))
+
+    def get_dataset_items(self, key, value, collection=DEFAULT_COLLECTION):
+        """Retourne tous les éléments de la collection dont `key` vaut `value` (liste éventuellement vide).
+
+        Examples:
+        | ${users}= | Get Dataset Items | profile | instructeur |
+        | ${users}= | Get Dataset Items | role | customer | collection=utilisateurs |
+        """
+        return list(self._dataset.index(collection, key).get(str(value), ()))
+
+    def get_dataset_item(self, key, value, collection=DEFAULT_COLLECTION):
+        """Retourne le premier élément de la collection dont `key` vaut `value`.
+
+        Échoue si aucun élément ne correspond.
+
+        Examples:
+        | ${user}= | Get Dataset Item | profile | invité |
+        """
+        return self._matches(key, value, collection)[0]
+
+    def get_next_dataset_item(self, key, value, collection=DEFAULT_COLLECTION):
+        """Retourne les éléments correspondants à tour de rôle (round-robin) d'un appel à l'autre.
+
+        Examples:
+        | ${user}= | Get Next Dataset Item | profile | usager |
+        """
+        matches = self._matches(key, value, collection)
+        cursor = (collection, key, str(value))
+        position = self._cursors.get(cursor, 0)
+        self._cursors[cursor] = position + 1
+        return matches[position % len(matches)]
+
+    def get_random_dataset_item(self, key, value, collection=DEFAULT_COLLECTION):
+        """Retourne un élément correspondant tiré au hasard (tirage reproductible, voir `seed`).
+
+        Examples:
+        | ${user}= | Get Random Dataset Item | profile | usager |
+        """
+        return self._random.choice(self._matches(key, value, collection))
+
+    def _matches(self, key, value, collection):
+        matches = self._dataset.index(collection, key).get(str(value))
+        if not matches:
+            raise AssertionError(f"Aucun élément '{collection}' trouvé avec {key}=\"{value}\"")
+        return matches
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Librairie Robot Framework de lecture groupée du DOM pour `web_socle`.
+
+Lire le texte de N éléments avec `Obtenir Le Texte De L'Element` coûte N attentes
+et N allers-retours avec le navigateur. Ici un seul script est évalué dans la page :
+il attend que tous les localisateurs soient présents (et visibles), puis retourne en
+une fois texte, visibilité et attributs de tous les éléments.
+
+Le même script sert aux deux socles :
+  - Playwright : `Browser.Evaluate JavaScript` avec le script `script` (fonction asynchrone)
+  - Selenium : `SeleniumLibrary.Execute Async Javascript` avec le script `async_script`
+
+Localisateurs acceptés : XPath (`//...`, `(//...)`, `xpath=...`), `css=...`, `id=...`,
+`name=...`, `identifier=...` (Selenium, aussi avec `:`). Un localisateur sans préfixe suit la
+stratégie par défaut de la librairie du socle (option `default_strategy`) :
+  - css: sélecteur CSS (Browser / Playwright)
+  - default: id, sinon name (SeleniumLibrary)
+Les autres stratégies (text, class, link...) sont refusées : utiliser les mots-clés unitaires.
+"""
+
+import re
+
+from robot.utils import timestr_to_secs
+
+SUPPORTED_STRATEGIES = ('xpath', 'css', 'id', 'name', 'identifier')
+DEFAULT_STRATEGIES = ('css', 'default')
+# Préfixes de stratégies Browser / SeleniumLibrary non traduites par le script
+_UNSUPPORTED_STRATEGIES = ('text', 'class', 'tag', 'link', 'partial link', 'dom', 'jquery', 'sizzle',
+                           'data', 'data-testid', 'id-testid', 'role', 'nth', 'internal')
+_PREFIX = re.compile(r'^\s*([a-z][\w-]*(?: link)?)\s*([=:])\s*(.*)$', re.IGNORECASE | re.DOTALL)
+
+# Fonction évaluée dans la page : attente combinée puis extraction
+DOM_BATCH_FUNCTION = """async (request) => {
+  const all = (selector) => Array.from(document.querySelectorAll(selector));
+  const find = ([strategy, value]) => {
+    if (strategy === 'css') return all(value);
+    if (strategy === 'id') return all(`[id="${CSS.escape(value)}"]`);
+    if (strategy === 'name') return all(`[name="${CSS.escape(value)}"]`);
+    if (strategy === 'default' || strategy === 'identifier') {
+      const byId = all(`[id="${CSS.escape(value)}"]`);
+      return byId.length ? byId : all(`[name="${CSS.escape(value)}"]`);
+    }
+    const snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const elements = [];
+    for (let i = 0; i < snapshot.snapshotLength; i++) elements.push(snapshot.snapshotItem(i));
+    return elements;
+  };
+  const isVisible = (element) => {
+    if (!element.getClientRects || element.getClientRects().length === 0) return false;
+    const style = window.getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+  };
+  const ready = (elements) => elements.length > 0 && (!request.visible || elements.some(isVisible));
+  const deadline = Date.now() + request.timeout;
+  let found = request.queries.map(find);
+  while (!found.every(ready) && Date.now() < deadline) {
+    await new Promise((resolve) => setTimeout(resolve, 100));
+    found = request.queries.map(find);
+  }
+  const describe = (element) => {
+    const attributes = {};
+    for (const name of request.attributes) attributes[name] = element.getAttribute(name);
+    const value = ['INPUT', 'TEXTAREA', 'SELECT'].includes(element.tagName);
+    const text = value ? element.value : (element.innerText !== undefined ? element.innerText : element.textContent);
+    return {text: (text || '').trim(), visible: isVisible(element), attributes: attributes};
+  };
+  return found.map((elements) => (request.all ? elements : elements.slice(0, 1)).map(describe));
+}"""
+
+# Enveloppe Selenium : le dernier argument de Execute Async Javascript est la fonction de retour
+DOM_BATCH_ASYNC_SCRIPT = ("const done = arguments[arguments.length - 1];\n"
+                          f"({DOM_BATCH_FUNCTION})(arguments[0]).then(done, (error) => done({{error: String(error)}}));")
+
+
+class DomBatch:
+    """Préparation et contrôle des lectures groupées du DOM (voir `web_socle`).
+
+    Options:
+      - default_strategy: stratégie des localisateurs sans préfixe, comme la librairie du socle
+        (`css` pour Browser, `default` pour SeleniumLibrary : id, sinon name)
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    def __init__(self, default_strategy='css'):
+        default_strategy = str(default_strategy).strip().lower()
+        if default_strategy not in DEFAULT_STRATEGIES:
+            raise ValueError(f"Stratégie par défaut '{default_strategy}' inconnue, attendu : "
+                             f"{', '.join(DEFAULT_STRATEGIES)}")
+        self.default_strategy = default_strategy
+        # SeleniumLibrary accepte aussi `strategy:valeur`
+        self._separators = '=:' if default_strategy == 'default' else '='
+
+    def _query(self, locator: str) -> list:
+        """Traduit un localisateur en [stratégie, valeur] pour le script."""
+        if locator.startswith(('/', '(', '..')):
+            return ['xpath', locator]
+        match = _PREFIX.match(locator)
+        if match and match.group(2) in self._separators:
+            strategy = match.group(1).lower()
+            if strategy in SUPPORTED_STRATEGIES:
+                return [strategy, match.group(3)]
+            if strategy in _UNSUPPORTED_STRATEGIES:
+                raise ValueError(f"Stratégie '{strategy}' non supportée par la lecture groupée ({locator}), "
+                                 f"attendu : {', '.join(SUPPORTED_STRATEGIES)} ou un localisateur sans préfixe")
+        return [self.default_strategy, locator]
+
+    def build_dom_batch_request(self, locators, attributes=None, timeout='30 seconds', visible=True,
+                                all_elements=False) -> dict:
+        """Prépare une lecture groupée : dictionnaire `script`, `async_script` et `arguments` du script.
+
+        - locators: liste de localisateurs (ou un seul localisateur)
+        - attributes: noms des attributs à lire pour chaque élément
+        - timeout: attente maximale combinée de tous les localisateurs (format Robot, ex: 30 seconds)
+        - visible: attendre qu'au moins un élément de chaque localisateur soit visible
+        - all_elements: retourner tous les éléments de chaque localisateur (sinon le premier)
+
+        Examples:
+        | ${requete}= | Build Dom Batch Request | ${locators} | attributes=${{['href']}} | timeout=10 seconds |
+        """
+        if isinstance(locators, str):
+            locators = [locators]
+        if isinstance(attributes, str):
+            attributes = [a.strip() for a in attributes.split(',') if a.strip()]
+        # marge d'une seconde : l'attente dans la page doit finir avant le timeout de script du navigateur
+        timeout_ms = max(0, int((timestr_to_secs(timeout) - 1) * 1000))
+        locators = [str(locator) for locator in locators]
+        return {
+            'script': DOM_BATCH_FUNCTION,
+            'async_script': DOM_BATCH_ASYNC_SCRIPT,
+            'arguments': {
+                'locators': locators,
+                'queries': [self._query(locator) for locator in locators],
+                'attributes': list(attributes or []),
+                'timeout': timeout_ms,
+                'visible': bool(visible),
+                'all': bool(all_elements),
+            },
+        }
+
+    def check_dom_batch_results(self, results, request, strict=True) -> list:
+        """Contrôle le résultat du script et le met en forme, un élément de liste par localisateur.
+
+        Sans `all_elements`, chaque localisateur donne un dictionnaire `locator`, `text`, `visible`,
+        `attributes` (texte None si l'élément est absent) ; avec `all_elements`, la liste de ces
+        dictionnaires pour tous les éléments trouvés.
+        Avec `strict`, échoue en listant les localisateurs absents (ou non visibles si demandé).
+        """
+        if isinstance(results, dict) and 'error' in results:
+            raise AssertionError(f"Erreur du script de lecture groupée : {results['error']}")
+        arguments = request['arguments']
+        locators = arguments['locators']
+        if not isinstance(results, list) or len(results) != len(locators):
+            raise AssertionError(f"Résultat inattendu du script de lecture groupée : {results}")
+
+        missing = [locator for locator, elements in zip(locators, results)
+                   if not elements or (arguments['visible'] and not any(e['visible'] for e in elements))]
+        if strict and missing:
+            state = "introuvables ou non visibles" if arguments['visible'] else "introuvables"
+            raise AssertionError(f"{len(missing)} élément(s) {state} : " + ", ".join(missing))
+
+        shaped = []
+        for locator, elements in zip(locators, results):
+            elements = [{'locator': locator, **element} for element in elements]
+            if arguments['all']:
+                shaped.append(elements)
+            else:
+                shaped.append(elements[0] if elements else
+                              {'locator': locator, 'text': None, 'visible': False, 'attributes': {}})
+        return shaped
@@ -3,8 +3,71 @@ Librairie Robot Framework pour convertir les tables Gherkin en dictionnaires Pyt
 
 Cette libraire fournit des keywords pour transformer les données tabulaires
 du parser Gherkin en structures de données Python (dict, list).
+
+Les grandes tables (Exemples, exports de tableurs) peuvent être parcourues
+ligne par ligne sans tout matérialiser, avec conversion de types par colonne.
 """
 
+import itertools
+import json
+from collections.abc import Mapping
+from datetime import datetime
+
+
+def _to_bool(value):
+    text = value.strip().lower()
+    if text in ('true', 'vrai', 'oui', 'yes', 'y', 'o', '1', 'x'):
+        return True
+    if text in ('false', 'faux', 'non', 'no', 'n', '0'):
+        return False
+    raise ValueError(f"Booléen invalide : '{value}'")
+
+
+def _to_date(value):
+    text = value.strip()
+    for fmt in ('%Y-%m-%d', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            pass
+    raise ValueError(f"Date invalide : '{value}' (formats acceptés : AAAA-MM-JJ, JJ/MM/AAAA)")
+
+
+# Conversions disponibles pour le schéma d'une table
+COERCERS = {
+    'str': str,
+    'int': lambda value: int(value.strip()),
+    'float': lambda value: float(value.strip().replace(',', '.')),
+    'bool': _to_bool,
+    'date': _to_date,
+    'json': json.loads,
+}
+
+
+class DatatableRow(Mapping):
+    """Ligne de table compacte : en-têtes partagés par toutes les lignes + tuple de valeurs.
+
+    Se comporte comme un dictionnaire en lecture (``${row}[colonne]``, ``dict(row)``).
+    """
+
+    __slots__ = ('_positions', '_values')
+
+    def __init__(self, positions, values):
+        self._positions = positions
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[self._positions[key]]
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __repr__(self):
+        return repr(dict(self))
+
 
 class GherkinDatatableConverter:
     """Convertisseur de tables Gherkin en dictionnaires Python.
@@ -44,7 +107,7 @@ class GherkinDatatableConverter:
         # Créer le dictionnaire
         return dict(zip(headers, values))
 
-    def convert_datatable_to_list_of_dicts(self, table_data):
+    def convert_datatable_to_list_of_dicts(self, table_data, types=None):
         """Convertit une table Gherkin en liste de dictionnaires.
         
         La première ligne est considérée comme les en-têtes,
@@ -52,24 +115,113 @@ class GherkinDatatableConverter:
         
         Args:
             table_data: Liste de dictionnaires contenant les cellules au format Gherkin
+            types: Conversion optionnelle par colonne (voir `Iterate Datatable Rows`)
             
         Returns:
             Liste de dictionnaires, une pour chaque ligne de données
             
+        Raises:
+            ValueError: si une ligne n'a pas le même nombre de cellules que les en-têtes
+            
         Examples:
         | ${result}= | Convert Datatable To List Of Dicts | ${table_data} |
         | Log Many | @{result} |
         """
-        if not table_data or len(table_data) < 2:
-            return []
+        return [dict(row) for row in self.iterate_datatable_rows(table_data, types)]
+
+    def convert_datatable_to_rows(self, table_data, types=None):
+        """Convertit une table Gherkin en liste de lignes compactes (`DatatableRow`).
         
-        # Extraire les en-têtes
-        headers = [cell['value'] for cell in table_data[0]['cells']]
+        Les en-têtes sont partagés par toutes les lignes, chaque ligne ne stocke
+        que le tuple de ses valeurs ; l'accès se fait comme pour un dictionnaire.
         
-        # Créer une liste de dictionnaires pour chaque ligne
-        result = []
-        for row in table_data[1:]:
-            values = [cell['value'] for cell in row['cells']]
-            result.append(dict(zip(headers, values)))
+        Args:
+            table_data: Liste de dictionnaires contenant les cellules au format Gherkin
+            types: Conversion optionnelle par colonne (voir `Iterate Datatable Rows`)
+            
+        Returns:
+            Liste de lignes, une pour chaque ligne de données
+            
+        Examples:
+        | ${rows}= | Convert Datatable To Rows | ${table_data} | types=age:int |
+        | Log | ${rows}[0][age] |
+        """
+        return list(self.iterate_datatable_rows(table_data, types))
+
+    def iterate_datatable_rows(self, table_data, types=None):
+        """Parcourt une table Gherkin ligne par ligne sans matérialiser la table convertie.
+        
+        La première ligne est considérée comme les en-têtes. Chaque ligne suivante
+        est produite à la demande sous forme de `DatatableRow` (lecture comme un dict).
         
-        return result
+        Args:
+            table_data: Liste de dictionnaires contenant les cellules au format Gherkin
+            types: Conversion par colonne, déclarée une fois pour la table :
+                dictionnaire {colonne: type} ou texte "colonne:type, colonne:type".
+                Types : str, int, float, bool, date, json. Une cellule vide donne None.
+            
+        Returns:
+            Générateur de lignes
+            
+        Raises:
+            ValueError: si une ligne n'a pas le même nombre de cellules que les en-têtes,
+                si une colonne typée est inconnue ou si une valeur ne peut être convertie
+            
+        Examples:
+        | ${rows}= | Iterate Datatable Rows | ${table_data} | types=montant:float, actif:bool |
+        | FOR | ${row} | IN | @{rows} |
+        |     | Log | ${row}[montant] |
+        | END |
+        """
+        if not table_data or len(table_data) < 2:
+            return iter(())
+
+        headers = tuple(cell['value'] for cell in table_data[0]['cells'])
+        positions = {header: index for index, header in enumerate(headers)}
+        converters = self._compile_schema(types, positions)
+        return self._generate_rows(table_data, headers, positions, converters)
+
+    @staticmethod
+    def _compile_schema(types, positions):
+        """Retourne la liste (index de colonne, nom, conversion) déduite du schéma."""
+        if not types:
+            return []
+        if isinstance(types, str):
+            declared = {}
+            for item in types.split(','):
+                if item.strip():
+                    column, _, type_name = item.partition(':')
+                    declared[column.strip()] = type_name.strip()
+            types = declared
+
+        converters = []
+        for column, type_name in types.items():
+            if column not in positions:
+                raise ValueError(f"Colonne typée inconnue : '{column}' (en-têtes : {', '.join(positions)})")
+            coercer = COERCERS.get(str(type_name).lower())
+            if coercer is None:
+                raise ValueError(f"Type inconnu '{type_name}' pour la colonne '{column}' "
+                                 f"(types : {', '.join(COERCERS)})")
+            converters.append((positions[column], column, coercer))
+        return converters
+
+    @staticmethod
+    def _generate_rows(table_data, headers, positions, converters):
+        width = len(headers)
+        for line, row in enumerate(itertools.islice(table_data, 1, None), start=2):
+            values = tuple(cell['value'] for cell in row['cells'])
+            if len(values) != width:
+                raise ValueError(f"Ligne {line} de la table : {len(values)} cellule(s) pour {width} en-tête(s)")
+            if converters:
+                values = list(values)
+                for index, column, coercer in converters:
+                    raw = values[index]
+                    if raw is None or raw == '':
+                        values[index] = None
+                        continue
+                    try:
+                        values[index] = coercer(raw)
+                    except ValueError as error:
+                        raise ValueError(f"Ligne {line}, colonne '{column}' : {error}") from None
+                values = tuple(values)
+            yield DatatableRow(positions, values)
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Fonctions utilitaires partagées par les librairies de `lib/`.
+
+  - to_bool: conversion des options texte (arguments Robot, variables d'environnement) en booléen
+  - atomic_path: écriture atomique d'un fichier partagé entre plusieurs workers (caches de WORKSPACE)
+"""
+
+import os
+from contextlib import contextmanager
+
+
+def to_bool(value, default: bool = False):
+    """Convertit une valeur texte (true/false, 1/0, yes/no, on/off) en booléen, `default` si vide."""
+    if value is None or str(value).strip() == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+@contextmanager
+def atomic_path(path: str):
+    """Retourne un chemin temporaire à remplir, qui remplace `path` en une opération à la sortie du bloc.
+
+    Plusieurs workers peuvent écrire le même fichier : un lecteur voit l'ancienne ou la
+    nouvelle version, jamais un fichier partiel. En cas d'erreur, le fichier temporaire est supprimé.
+
+    Examples:
+        with atomic_path(cache_path) as temp_path:
+            with open(temp_path, 'wb') as stream:
+                pickle.dump(data, stream)
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Exécution des features en parallèle sur plusieurs processus Robot Framework.
+
+Chaque worker est un processus `robot` indépendant :
+  - il exécute un lot de tests équilibré selon les durées passées (voir TestScheduler),
+    découpé par fichier de feature ou par scénario
+  - il a son propre WORKSPACE (`<WORKSPACE>/workers/worker_<n>`) : StepsLogger.log,
+    audits NDJSON et sorties Robot ne se mélangent pas
+  - il partage avec les autres workers le pool de réservation des jeux de données
+    (DATA_LEASE=true, voir DataLeaseLibrary), le cache des sessions authentifiées
+    et le cache de compilation des features (voir CachedGherkinParser)
+
+En fin d'exécution, les résultats sont fusionnés dans WORKSPACE :
+  - output.xml / log.html / report.html via rebot
+  - les audits NDJSON, ajoutés aux fichiers du WORKSPACE (historique conservé)
+  - StepsLogger.log, lignes des workers interclassées par horodatage et préfixées par le worker
+
+Usage (depuis la racine du projet, voir run/start_parallel.bat) :
+    python lib/ParallelRunner.py CU00 --workers 4 --web playwright --by feature --headless
+    python lib/ParallelRunner.py CU00 --workers 2 --by scenario -- --variable MY_VAR:1
+"""
+
+import argparse
+import heapq
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+from TestScheduler import build_suite, estimate_durations, load_history, shard_indices, _split
+from YamlVariables import load_yaml
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEB_DRIVERS = ('dry-run', 'selenium', 'playwright')
+# Début d'une ligne StepsLogger : horodatage ISO (les autres lignes continuent l'entrée précédente)
+_TIMESTAMP = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
+
+
+def _worker_environment(workspace: str, worker_workspace: str, args) -> dict:
+    env = dict(os.environ)
+    env['WORKSPACE'] = worker_workspace
+    env['HEADLESS_MODE'] = 'true' if args.headless else env.get('HEADLESS_MODE', 'false')
+    # ressources partagées entre workers : pool des jeux de données et sessions authentifiées
+    env.setdefault('DATA_LEASE', 'true')
+    env.setdefault('DATA_LEASE_DB', os.path.join(workspace, 'data_leases.sqlite'))
+    env.setdefault('STORAGE_STATE_DIR', os.path.join(workspace, '.storage_state'))
+    env.setdefault('FEATURE_CACHE_DIR', os.path.join(workspace, '.feature_cache'))
+    # toutes les estimations des workers doivent venir des mêmes audits (ceux du WORKSPACE principal)
+    env['TEST_SCHEDULER_AUDIT_DIR'] = workspace
+    return env
+
+
+def _prepare_worker_workspace(workspace: str, worker_workspace: str, settings_file: str) -> None:
+    """Recrée le WORKSPACE du worker avec les fichiers de configuration du WORKSPACE principal."""
+    shutil.rmtree(worker_workspace, ignore_errors=True)
+    os.makedirs(worker_workspace)
+    shutil.copy2(settings_file, worker_workspace)
+    # le fichier clé du coffre-fort est attendu dans WORKSPACE (voir vault_socle.resource)
+    keyfile = (load_yaml(settings_file).get('SETTINGS') or {}).get('vault_keepass_keyfile')
+    if keyfile and os.path.isfile(os.path.join(workspace, keyfile)):
+        shutil.copy2(os.path.join(workspace, keyfile), worker_workspace)
+
+
+def _robot_command(args, shard: int, shards: int, worker_workspace: str) -> list:
+    socle = os.path.join(PROJECT_DIR, 'resources', 'socle')
+    modifier = ';'.join([
+        os.path.join(PROJECT_DIR, 'lib', 'TestScheduler.py'),
+        f"shard={shard}", f"shards={shards}", f"by={args.by}",
+        *([f"include={args.include}"] if args.include else []),
+        *([f"exclude={args.exclude}"] if args.exclude else []),
+        *(["failing_first=true"] if args.failing_first else []),
+    ])
+    command = [
+        sys.executable, '-m', 'robot',
+        '--parser', os.path.join(PROJECT_DIR, 'lib', 'CachedGherkinParser.py'),
+        '--outputdir', worker_workspace,
+        '--output', 'output.xml', '--log', 'NONE', '--report', 'NONE',
+        '--language', args.language,
+        '--loglevel', 'TRACE',
+        '--variablefile', os.path.join(worker_workspace, 'settings.yaml'),
+        '--variable', f"HEADLESS_MODE:{'true' if args.headless else 'false'}",
+        '--pythonpath', os.pathsep.join([socle, os.path.join(socle, args.web)]),
+        '--prerunmodifier', modifier,
+        '--console', 'dotted',
+    ]
+    for tag in _split(args.include):
+        command += ['--include', tag]
+    for tag in _split(args.exclude):
+        command += ['--exclude', tag]
+    return command + args.robot_options + args.paths
+
+
+def merge_audits(workspace: str, worker_workspaces: list) -> None:
+    """Ajoute les audits NDJSON des workers aux fichiers du même nom dans WORKSPACE."""
+    for worker_workspace in worker_workspaces:
+        for name in sorted(os.listdir(worker_workspace)):
+            if name.endswith('.ndjson'):
+                with open(os.path.join(worker_workspace, name), 'rb') as source, \
+                        open(os.path.join(workspace, name), 'ab') as target:
+                    shutil.copyfileobj(source, target)
+
+
+def _tagged_entries(stream, tag: str):
+    """Itère sur (horodatage, entrée préfixée par le worker) d'un journal StepsLogger.
+
+    Une entrée regroupe une ligne horodatée et ses lignes de continuation (message
+    multi-ligne, ex: message d'échec), pour qu'elles restent ensemble à l'interclassement.
+    """
+    timestamp, block = '', []
+    for line in stream:
+        if _TIMESTAMP.match(line):
+            if block:
+                yield timestamp, ''.join(block)
+            timestamp, block = line.split(' ', 1)[0], []
+        block.append(f"{tag} {line}")
+    if block:
+        yield timestamp, ''.join(block)
+
+
+def merge_step_logs(workspace: str, worker_workspaces: list, name: str = 'StepsLogger.log') -> None:
+    """Interclasse les journaux StepsLogger des workers par horodatage, chaque ligne préfixée par son worker.
+
+    Les lignes de continuation d'un message multi-ligne restent à la suite de leur ligne horodatée.
+    """
+    streams = []
+    try:
+        for worker_workspace in worker_workspaces:
+            path = os.path.join(worker_workspace, name)
+            if os.path.isfile(path):
+                streams.append(open(path, encoding='UTF8'))
+        # chaque journal est déjà ordonné : interclassement en flux, sans tout charger en mémoire
+        entries = [_tagged_entries(stream, f"[w{number}]") for number, stream in enumerate(streams, start=1)]
+        with open(os.path.join(workspace, name), 'w', encoding='UTF8') as target:
+            for _, entry in heapq.merge(*entries, key=lambda item: item[0]):
+                target.write(entry)
+    finally:
+        for stream in streams:
+            stream.close()
+
+
+def merge_outputs(args, workspace: str, outputs: list) -> int:
+    """Fusionne les output.xml des workers avec rebot et retourne son code retour."""
+    command = [sys.executable, '-m', 'robot.rebot', '--name', args.name, '--outputdir', workspace,
+               '--output', 'output.xml', '--log', 'log.html', '--report', 'report.html', *outputs]
+    return subprocess.call(command)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Exécution parallèle des features Robot Framework")
+    parser.add_argument('include', nargs='?', default=None, help="tags des tests à exécuter, séparés par des virgules")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="nombre de processus (défaut: nombre de coeurs)")
+    parser.add_argument('--web', choices=WEB_DRIVERS, default='dry-run', help="socle web (défaut: dry-run)")
+    parser.add_argument('--by', choices=('feature', 'scenario'), default='feature', help="unité de répartition")
+    parser.add_argument('--exclude', default=None, help="tags exclus, séparés par des virgules")
+    parser.add_argument('--failing-first', action='store_true', help="tests en échec récent en premier")
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--language', default='fr')
+    parser.add_argument('--name', default='Features', help="nom de la suite fusionnée")
+    parser.add_argument('--paths', nargs='+', default=[os.path.join(PROJECT_DIR, 'features')])
+    # les options placées après -- (ex: -- --variable X:1) sont transmises telles quelles à robot
+    argv = list(sys.argv[1:] if argv is None else argv)
+    separator = argv.index('--') if '--' in argv else len(argv)
+    args = parser.parse_args(argv[:separator])
+    args.robot_options = argv[separator + 1:]
+
+    workspace = os.path.abspath(os.environ.get('WORKSPACE') or os.path.join(PROJECT_DIR, 'run', 'workspace'))
+    settings_file = os.path.join(workspace, 'settings.yaml')
+
+    # même plan que celui que chaque worker recalculera dans son pre-run modifier
+    suite = build_suite(args.paths, args.language)
+    if args.include or args.exclude:
+        suite.filter(included_tags=_split(args.include) or None, excluded_tags=_split(args.exclude) or None)
+    tests = list(suite.all_tests)
+    if not tests:
+        print("Aucun test à exécuter.")
+        return 252
+    shards = max(1, min(args.workers, len(tests)))
+    plan = shard_indices(tests, estimate_durations(tests, load_history(workspace)), shards, args.by)
+
+    workers = []
+    for shard, indices in enumerate(plan, start=1):
+        if not indices:
+            continue
+        worker_workspace = os.path.join(workspace, 'workers', f"worker_{shard}")
+        _prepare_worker_workspace(workspace, worker_workspace, settings_file)
+        console = open(os.path.join(worker_workspace, 'console.log'), 'w', encoding='UTF8')
+        process = subprocess.Popen(_robot_command(args, shard, shards, worker_workspace), cwd=PROJECT_DIR,
+                                   env=_worker_environment(workspace, worker_workspace, args),
+                                   stdout=console, stderr=subprocess.STDOUT)
+        workers.append((shard, len(indices), worker_workspace, process, console))
+        print(f"Worker {shard} : {len(indices)} test(s), WORKSPACE={worker_workspace}")
+
+    start = time.monotonic()
+    for shard, count, worker_workspace, process, console in workers:
+        process.wait()
+        console.close()
+        print(f"Worker {shard} terminé (code {process.returncode}) - voir {worker_workspace}/console.log")
+    print(f"Exécution parallèle : {time.monotonic() - start:.1f} s sur {len(workers)} worker(s)")
+
+    worker_workspaces = [worker[2] for worker in workers]
+    merge_audits(workspace, worker_workspaces)
+    merge_step_logs(workspace, worker_workspaces)
+    outputs = [os.path.join(w, 'output.xml') for w in worker_workspaces if os.path.isfile(os.path.join(w, 'output.xml'))]
+    if not outputs:
+        print("Aucun output.xml produit par les workers.")
+        return 252
+    return merge_outputs(args, workspace, outputs)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
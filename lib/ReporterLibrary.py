@@ -2,20 +2,333 @@
 This is the robot listener to store each test status and elapsed time to a NDJSON file named with suitename
 """
 
+import atexit
 import json
 import os
 import pathlib
+import threading
 from datetime import datetime
-from StepsLogger import StepsLogger
+from LibraryUtils import to_bool
+from StepsLogger import LEVELS, StepsLogger
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Lit un booléen depuis une variable d'environnement."""
+    return to_bool(os.environ.get(name), default)
+
+
+class NdjsonAuditWriter(object):
+    """
+    Écrivain NDJSON bufferisé, partagé par toutes les instances du listener.
+
+    - un handle ouvert par fichier `source` pendant toute l'exécution
+    - les enregistrements sont accumulés en mémoire puis écrits par un thread
+      d'arrière-plan dès que `max_records` est atteint ou toutes les `flush_interval` secondes
+    - flush garanti sur `close()` (fin de suite / fin d'exécution) et à la sortie de l'interpréteur
+    - `buffered=False` revient au comportement historique : ouverture/écriture/fermeture par enregistrement
+
+    Options (variables d'environnement) :
+      - AUDIT_NDJSON_BUFFERED : true/false (défaut: true)
+      - AUDIT_NDJSON_FLUSH_RECORDS : nombre d'enregistrements déclenchant un flush (défaut: 200)
+      - AUDIT_NDJSON_FLUSH_INTERVAL : délai max en secondes entre deux flush (défaut: 2.0)
+    """
+
+    def __init__(self, buffered: bool = True, max_records: int = 200, flush_interval: float = 2.0):
+        self.buffered = bool(buffered)
+        self.max_records = max(1, int(max_records))
+        self.flush_interval = max(0.05, float(flush_interval))
+
+        # _lock protège les buffers, _io_lock sérialise les écritures fichiers (ordre préservé)
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._buffers: dict[str, list[str]] = {}
+        self._handles: dict = {}
+        self._pending = 0
+
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        atexit.register(self.close)
+
+    @classmethod
+    def from_environment(cls) -> "NdjsonAuditWriter":
+        """Construit l'écrivain à partir des variables d'environnement AUDIT_NDJSON_*."""
+        return cls(
+            buffered=_env_bool('AUDIT_NDJSON_BUFFERED', True),
+            max_records=int(os.environ.get('AUDIT_NDJSON_FLUSH_RECORDS', 200)),
+            flush_interval=float(os.environ.get('AUDIT_NDJSON_FLUSH_INTERVAL', 2.0)),
+        )
+
+    def configure(self, buffered: bool = None, max_records: int = None, flush_interval: float = None) -> None:
+        """Modifie les options à la volée ; le passage en mode direct vide d'abord les buffers."""
+        if buffered is not None and not buffered and self.buffered:
+            self.close()
+        if buffered is not None:
+            self.buffered = bool(buffered)
+        if max_records is not None:
+            self.max_records = max(1, int(max_records))
+        if flush_interval is not None:
+            self.flush_interval = max(0.05, float(flush_interval))
+
+    def write(self, file_path: str, line: str) -> None:
+        """Ajoute une ligne NDJSON (saut de ligne inclus) pour le fichier donné."""
+        if not self.buffered:
+            with open(file_path, 'a', encoding='UTF8') as ndjson_file:
+                ndjson_file.write(line)
+            return
+
+        with self._lock:
+            self._buffers.setdefault(file_path, []).append(line)
+            self._pending += 1
+            if self._pending >= self.max_records:
+                self._wakeup.set()
+
+        self._ensure_thread()
+
+    def flush(self) -> None:
+        """Écrit tous les enregistrements en attente sur disque."""
+        with self._io_lock:
+            with self._lock:
+                buffers, self._buffers = self._buffers, {}
+                self._pending = 0
+
+            for file_path, lines in buffers.items():
+                handle = self._handles.get(file_path)
+                if handle is None:
+                    handle = open(file_path, 'a', encoding='UTF8')
+                    self._handles[file_path] = handle
+                handle.write(''.join(lines))
+                handle.flush()
+
+    def close(self) -> None:
+        """Arrête le thread, vide les buffers et ferme les handles (réouverts au besoin ensuite)."""
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            self._wakeup.set()
+            thread.join()
+            self._thread = None
+            self._stop.clear()
+
+        self.flush()
+
+        with self._io_lock:
+            for handle in self._handles.values():
+                try:
+                    handle.close()
+                except OSError:
+                    pass
+            self._handles.clear()
+
+    # ---------- thread d'arrière-plan ----------
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='NdjsonAuditWriter', daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except OSError:
+                # Ne jamais interrompre l'exécution des tests pour un problème d'audit
+                pass
+
+
+# Écrivain unique pour tout le processus (le listener est instancié plusieurs fois)
+AUDIT_WRITER = NdjsonAuditWriter.from_environment()
+
+# Couches tracées par le listener, déduites du suffixe du nom de bibliothèque (ex: login_page -> 'page')
+TRACE_LAYERS = ("step", "service", "page", "socle")
+
+# Ordre des niveaux de log Robot
+LOG_LEVEL_ORDER = {"TRACE": 0, "DEBUG": 1, "INFO": 2, "WARN": 3, "ERROR": 4}
+
+
+class KeywordProfiler(object):
+    """
+    Profilage des mots-clés : agrégation des durées par mot-clé et par couche.
+
+    - pour chaque mot-clé (`libname.kwname`) : nombre d'appels, durée totale, durée propre
+      (hors mots-clés imbriqués), moyenne, p50, p95 et max
+    - pour chaque couche (step, service, page, socle, `library` pour les librairies externes)
+      les mêmes indicateurs ; la somme des durées propres d'une couche est le temps passé dans cette couche
+    - le résumé est écrit en fin d'exécution dans WORKSPACE : `<file_name>.json` et `<file_name>.txt`
+      (tableau trié par durée propre décroissante)
+
+    Options (variables d'environnement) :
+      - REPORTER_PROFILE : true/false (défaut: false)
+      - REPORTER_PROFILE_FILE : nom des fichiers du résumé, sans extension (défaut: keyword_profile)
+    """
+
+    KEYWORD_TYPES = frozenset(("KEYWORD", "SETUP", "TEARDOWN"))
+
+    def __init__(self, enabled: bool = False, file_name: str = "keyword_profile"):
+        self.enabled = bool(enabled)
+        self.file_name = file_name
+        self._durations: dict[str, list[int]] = {}
+        self._self_totals: dict[str, int] = {}
+        self._layers: dict[str, str] = {}
+        # Pile des durées des mots-clés enfants, un élément par mot-clé en cours
+        self._children: list[int] = []
+        self._lock = threading.Lock()
+        atexit.register(self.write_summary)
+
+    @classmethod
+    def from_environment(cls) -> "KeywordProfiler":
+        """Construit le profileur à partir des variables d'environnement REPORTER_PROFILE*."""
+        return cls(
+            enabled=_env_bool('REPORTER_PROFILE', False),
+            file_name=os.environ.get('REPORTER_PROFILE_FILE', 'keyword_profile'),
+        )
+
+    def start_keyword(self) -> None:
+        self._children.append(0)
+
+    def end_keyword(self, libname: str, kwname: str, elapsed: int, status: str) -> None:
+        children = self._children.pop() if self._children else 0
+        if self._children:
+            self._children[-1] += elapsed
+        if status == 'NOT RUN':
+            return
+
+        keyword = f"{libname}.{kwname}" if libname else kwname
+        with self._lock:
+            durations = self._durations.get(keyword)
+            if durations is None:
+                durations = self._durations[keyword] = []
+                self._self_totals[keyword] = 0
+                layer = libname.rpartition('_')[2].lower()
+                self._layers[keyword] = layer if layer in TRACE_LAYERS else "library"
+            durations.append(elapsed)
+            self._self_totals[keyword] += max(0, elapsed - children)
+
+    @staticmethod
+    def _statistics(durations: list, self_total: int) -> dict:
+        ordered = sorted(durations)
+        count = len(ordered)
+
+        def percentile(p):
+            # rang le plus proche
+            return ordered[max(0, -(-p * count // 100) - 1)]
+
+        return {
+            'count': count,
+            'total_ms': sum(ordered),
+            'self_ms': self_total,
+            'mean_ms': round(sum(ordered) / count, 1),
+            'p50_ms': percentile(50),
+            'p95_ms': percentile(95),
+            'max_ms': ordered[-1],
+        }
+
+    def summary(self) -> dict:
+        """Retourne le résumé du profilage : mots-clés et couches triés par durée propre décroissante."""
+        with self._lock:
+            keywords = []
+            layers: dict[str, tuple[list, int]] = {}
+            for keyword, durations in self._durations.items():
+                layer = self._layers[keyword]
+                self_total = self._self_totals[keyword]
+                keywords.append({'keyword': keyword, 'layer': layer, **self._statistics(durations, self_total)})
+                layer_durations, layer_self = layers.get(layer, ([], 0))
+                layers[layer] = (layer_durations + durations, layer_self + self_total)
+
+        return {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'keywords': sorted(keywords, key=lambda k: k['self_ms'], reverse=True),
+            'layers': sorted(({'layer': layer, **self._statistics(durations, self_total)}
+                              for layer, (durations, self_total) in layers.items()),
+                             key=lambda k: k['self_ms'], reverse=True),
+        }
+
+    @staticmethod
+    def format_table(summary: dict) -> str:
+        """Formate le résumé en tableaux texte (couches puis mots-clés)."""
+        columns = ('count', 'total_ms', 'self_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms')
+        lines = []
+        for title, rows, name in (("Couche", summary['layers'], 'layer'), ("Mot-clé", summary['keywords'], 'keyword')):
+            width = max([len(title)] + [len(row[name]) for row in rows])
+            lines.append(f"{title:<{width}}  " + "  ".join(f"{c:>9}" for c in columns))
+            lines.append("-" * (width + 11 * len(columns)))
+            for row in rows:
+                lines.append(f"{row[name]:<{width}}  " + "  ".join(f"{row[c]:>9}" for c in columns))
+            lines.append("")
+        return "\n".join(lines)
+
+    def write_summary(self) -> None:
+        """Écrit le résumé JSON et texte dans WORKSPACE (sans effet si rien n'a été profilé)."""
+        if not self.enabled or not self._durations:
+            return
+        summary = self.summary()
+        base = os.path.join(os.environ.get('WORKSPACE', '.'), self.file_name)
+        with open(f"{base}.json", 'w', encoding='UTF8') as json_file:
+            json.dump(summary, json_file, ensure_ascii=False, indent=2)
+        with open(f"{base}.txt", 'w', encoding='UTF8') as text_file:
+            text_file.write(self.format_table(summary))
+
+
+# Profileur unique pour tout le processus (activé par REPORTER_PROFILE=true)
+PROFILER = KeywordProfiler.from_environment()
+
+
+def enabled_trace_layers(trace_level: str = None, trace_categories: str = None) -> frozenset:
+    """
+    Retourne les couches dont les débuts/fins de mots-clés sont tracés.
+
+    Args:
+        trace_level: niveau minimal (TRACE, DEBUG, INFO...) ; une couche dont le niveau StepsLogger
+            est inférieur est désactivée (ex: INFO désactive SOCLE qui logge en DEBUG).
+            Défaut: variable d'environnement REPORTER_TRACE_LEVEL, sinon TRACE (tout est tracé).
+        trace_categories: liste de couches séparées par des virgules (ex: "step,service,page").
+            Défaut: variable d'environnement REPORTER_TRACE_CATEGORIES, sinon toutes les couches.
+    """
+    level = (trace_level or os.environ.get('REPORTER_TRACE_LEVEL') or "TRACE").strip().upper()
+    threshold = LOG_LEVEL_ORDER.get(level)
+    if threshold is None:
+        raise ValueError(f"Niveau de trace inconnu '{level}', attendu parmi {', '.join(LOG_LEVEL_ORDER)}")
+
+    categories = trace_categories if trace_categories is not None else os.environ.get('REPORTER_TRACE_CATEGORIES', '')
+    if isinstance(categories, str):
+        categories = [c for c in categories.replace(';', ',').split(',')]
+    wanted = {c.strip().lower() for c in categories if c.strip()} or set(TRACE_LAYERS)
+
+    return frozenset(
+        layer for layer in TRACE_LAYERS
+        if layer in wanted and LOG_LEVEL_ORDER[LEVELS[layer][0].strip()] >= threshold
+    )
 
 
 class ReporterLibrary(object):
+    # Portée globale : une seule instance pour l'exécution, `_close` n'est appelé qu'en fin
+    # d'exécution (les handles NDJSON restent ouverts d'un test à l'autre)
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
     ROBOT_LISTENER_API_VERSION = 2
 
-    def __init__(self):
+    def __init__(self, audit_buffered=None, audit_flush_records=None, audit_flush_interval=None,
+                 trace_level=None, trace_categories=None, profile=None):
         self.ROBOT_LIBRARY_LISTENER = self
         self._logger = StepsLogger(tz="UTC", ms3=True, color=True, emoji=True, colored_console=False)
 
+        # Table de dispatch construite une seule fois : seules les couches actives y figurent
+        self._trace_layers = enabled_trace_layers(trace_level, trace_categories)
+        self._start_dispatch = {layer: getattr(self._logger, layer) for layer in self._trace_layers}
+        self._audit_writer = AUDIT_WRITER
+        self._audit_writer.configure(
+            buffered=to_bool(audit_buffered, None),
+            max_records=audit_flush_records,
+            flush_interval=audit_flush_interval,
+        )
+        if to_bool(profile, None) is not None:
+            PROFILER.enabled = to_bool(profile)
+        self._profiler = PROFILER if PROFILER.enabled else None
+
     @staticmethod
     def extract_suite_and_test(longname: str, sep: str = '.') -> tuple[str, str]:
         """
@@ -76,6 +389,8 @@ class ReporterLibrary(object):
         """
         Enregistre le résultat d'un test dans un fichier NDJSON.
         Orchestration complète du traitement.
+
+        L'écriture passe par l'écrivain bufferisé `AUDIT_WRITER` (voir `NdjsonAuditWriter`).
         
         Args:
             audit_trail: données d'audit à écrire dans le fichier NDJSON
@@ -85,8 +400,7 @@ class ReporterLibrary(object):
         file_path = os.path.join(os.environ.get('WORKSPACE', '.'), audit_trail['source'])
         
         # Écrire les données
-        with open(file_path, 'a', encoding='UTF8') as ndjson_file:
-            ndjson_file.write(json.dumps(audit_trail) + '\n')
+        AUDIT_WRITER.write(file_path, json.dumps(audit_trail) + '\n')
 
     def _end_test(self, name, attrs):
         """Orchestration pour traiter la fin d'un test."""
@@ -100,59 +414,60 @@ class ReporterLibrary(object):
         self._logger.test(f"Test '{name}' terminé avec le statut: {audit_trail['test_status']} en {audit_trail['test_elapsed']} ms.") if audit_trail['test_status'] == 'PASS' else \
             self._logger.error(f"Test '{name}' échoué avec le message: {audit_trail['test_message']}", category="TEST")
     
+    def _end_suite(self, name, attrs):
+        """Vide les audits en attente à la fin de chaque suite, écrit le profilage en fin de suite racine."""
+        self._audit_writer.flush()
+        if self._profiler is not None and attrs.get('id') == 's1':
+            self._profiler.write_summary()
+
+    def _close(self):
+        """Fin d'exécution (ou fin de portée de la librairie) : flush et fermeture des fichiers d'audit."""
+        self._audit_writer.close()
+
     def _start_test(self, name, attrs):
         """Log le début d'un test."""
         self._logger.test(f"Démarrage du test '{name}'.")
 
     def _start_keyword(self, name, attrs):
         """Log le début d'un mot-clé."""
-        #obtenir le type de bibliotheque socle, step, service, page à partir du suffixe du nom de la bibliothèque
-        lib_type = attrs['libname'].split('_')[-1].lower()
-
-        # Construire le message
-        msg = f"Démarrage du mot-clé '{attrs['libname']}.{attrs['kwname']}'."
-
-        # Fonction no-op (ne fait rien)
-        def _noop(_): 
-            return None
-
-        # Dictionnaire de mapping type -> méthode du logger
-        switch = {
-            "": _noop,  # Pas de log pour les keywords sans type
-            "page":    self._logger.page,
-            "service": self._logger.service,
-            "socle":   self._logger.socle,
-            "step":    self._logger.step
-        }
+        if self._profiler is not None and attrs.get('type') in KeywordProfiler.KEYWORD_TYPES:
+            self._profiler.start_keyword()
+
+        # On vérifie que la clé est bien un keyword en démarrage avant tout calcul.
+        if attrs.get('type') != 'KEYWORD' or attrs.get('status') != 'NOT SET':
+            return
 
-        # Appel via get() avec fallback (par exemple step).
-        # On vérifie que la clé est bien un keyword en démarrage avant d'appeler.
-        if attrs.get('type') == 'KEYWORD' and attrs.get('status') == 'NOT SET':
-            func = switch.get(lib_type, _noop)
-            if callable(func):
-                func(msg)
+        # obtenir le type de bibliotheque socle, step, service, page à partir du suffixe du nom de la bibliothèque
+        # Couche désactivée ou keyword sans type -> aucun message construit
+        libname = attrs['libname']
+        func = self._start_dispatch.get(libname.rpartition('_')[2].lower())
+        if func is None:
+            return
+
+        func(f"Démarrage du mot-clé '{libname}.{attrs['kwname']}'.")
     
     def _end_keyword(self, name, attrs):
         """Log la fin d'un mot-clé."""
         # obtenir le type de bibliothèque depuis le suffixe du nom (ex: Mindefconnect_page -> 'page')
         libname = attrs.get('libname', '')
-        lib_type = libname.split('_')[-1].lower() if libname else ''
+        lib_type = libname.rpartition('_')[2].lower()
 
         status = attrs.get('status', '')
 
-        # types considérés comme pertinents pour un log de succès
-        known_types = {"page", "service", "socle", "step"}
+        if self._profiler is not None and attrs.get('type') in KeywordProfiler.KEYWORD_TYPES:
+            self._profiler.end_keyword(libname, attrs.get('kwname', ''), attrs.get('elapsedtime', 0), status)
 
-        # Si PASS et type connu -> success
-        if status == 'PASS' and lib_type in known_types:
-            self._logger.success(
-                f"Fin du mot-clé '{libname}.{attrs.get('kwname', '')}' avec le statut: {status} en {attrs.get('elapsedtime', 0)} ms.",
-                category=lib_type.upper()
-            )
+        # Si PASS et couche tracée -> success
+        if status == 'PASS':
+            if lib_type in self._trace_layers:
+                self._logger.success(
+                    f"Fin du mot-clé '{libname}.{attrs.get('kwname', '')}' avec le statut: {status} en {attrs.get('elapsedtime', 0)} ms.",
+                    category=lib_type.upper()
+                )
             return
 
-        # Si tout autre status différent de PASS -> log d'erreur (quel que soit le type)
-        if status == 'FAIL' and lib_type in known_types:
+        # Les échecs sont toujours loggés pour une couche connue, même désactivée
+        if status == 'FAIL' and lib_type in TRACE_LAYERS:
             self._logger.error(
                 f"Echec du mot-clé '{libname}.{attrs.get('kwname', '')}'.",
                 category=lib_type.upper()
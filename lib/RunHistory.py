@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+"""
+Historique des exécutions : ingestion des fichiers d'audit NDJSON dans une base SQLite
+et analyses de tendance (durées, ralentissements, instabilité).
+
+Les fichiers `<suite>.ndjson` écrits par ReporterLibrary dans WORKSPACE sont ingérés
+incrémentalement : la base mémorise pour chaque fichier la position (octets) déjà lue,
+seules les nouvelles lignes sont insérées, par lots, sans charger le fichier en mémoire.
+Un fichier plus court que la position mémorisée (purge du workspace) est relu depuis le début.
+
+Variables d'environnement :
+  - RUN_HISTORY_DB: chemin de la base (défaut: WORKSPACE/run_history.sqlite)
+  - RUN_HISTORY_WAL: journal WAL de la base (défaut: false ; à éviter sur un partage réseau, ex: NFS)
+
+Usage en ligne de commande :
+    python lib/RunHistory.py ingest [fichiers ou répertoires ...]   (défaut: WORKSPACE)
+    python lib/RunHistory.py trends [--test NOM] [--window 10]
+    python lib/RunHistory.py slowdowns [--threshold 0.2] [--window 10]
+    python lib/RunHistory.py flaky [--window 50] [--min-rate 0.05]
+    (option --json pour une sortie JSON)
+"""
+
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import statistics
+import sys
+from contextlib import closing
+
+from LibraryUtils import to_bool
+
+# Nombre de lignes insérées par transaction lors de l'ingestion
+BATCH_SIZE = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path    TEXT PRIMARY KEY,
+    offset  INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id          INTEGER PRIMARY KEY,
+    build_tag   TEXT NOT NULL,
+    job_name    TEXT NOT NULL,
+    timestamp   TEXT NOT NULL,
+    suite_name  TEXT NOT NULL,
+    test_name   TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    elapsed     INTEGER NOT NULL,
+    message     TEXT,
+    tags        TEXT
+);
+CREATE INDEX IF NOT EXISTS results_test ON results (suite_name, test_name, timestamp);
+CREATE INDEX IF NOT EXISTS results_build ON results (build_tag);
+"""
+
+# Exécutions d'un test, de la plus récente à la plus ancienne, numérotées par test
+_RANKED_RUNS = """
+SELECT suite_name, test_name, build_tag, timestamp, status, elapsed,
+       ROW_NUMBER() OVER (PARTITION BY suite_name, test_name ORDER BY timestamp DESC, id DESC) AS run_rank
+FROM results
+{where}
+"""
+
+
+def default_database() -> str:
+    return os.environ.get('RUN_HISTORY_DB') or os.path.join(os.environ.get('WORKSPACE', '.'), 'run_history.sqlite')
+
+
+def _percent(value: float) -> float:
+    return round(100.0 * value, 1)
+
+
+class RunHistory:
+    """Historique des résultats de tests, alimenté par les fichiers d'audit NDJSON.
+
+    Options:
+      - database: base SQLite (défaut: RUN_HISTORY_DB, sinon WORKSPACE/run_history.sqlite)
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    def __init__(self, database=None):
+        self.database = database or default_database()
+        self.wal = to_bool(os.environ.get('RUN_HISTORY_WAL'))
+        os.makedirs(os.path.dirname(os.path.abspath(self.database)), exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self):
+        connection = sqlite3.connect(self.database, timeout=30)
+        # WAL sur option : le journal WAL n'est pas fiable sur un partage réseau (ex: workspace NFS)
+        if self.wal:
+            connection.execute('PRAGMA journal_mode=WAL')
+        return connection
+
+    # ---------- ingestion ----------
+    def ingest_run_history(self, *paths) -> int:
+        """Ingère les nouvelles lignes des fichiers NDJSON et retourne le nombre d'enregistrements ajoutés.
+
+        Chaque chemin est un fichier `.ndjson` ou un répertoire (tous ses `*.ndjson`), défaut: WORKSPACE.
+
+        Examples:
+        | ${ajouts}= | Ingest Run History |
+        | ${ajouts}= | Ingest Run History | ${WORKSPACE}/ACME_-_s'authentifier.ndjson |
+        """
+        files = []
+        for path in paths or (os.environ.get('WORKSPACE', '.'),):
+            if os.path.isdir(path):
+                files.extend(sorted(glob.glob(os.path.join(path, '*.ndjson'))))
+            else:
+                files.append(path)
+
+        added = 0
+        with closing(self._connect()) as connection:
+            for file_path in files:
+                added += self._ingest_file(connection, os.path.abspath(file_path))
+        return added
+
+    def _ingest_file(self, connection, file_path: str) -> int:
+        row = connection.execute('SELECT offset FROM ingested_files WHERE path = ?', (file_path,)).fetchone()
+        offset = row[0] if row else 0
+        if os.path.getsize(file_path) < offset:
+            offset = 0  # fichier recréé depuis la dernière ingestion
+
+        added = 0
+        batch = []
+        with open(file_path, 'rb') as stream:
+            stream.seek(offset)
+            for raw in stream:
+                if not raw.endswith(b'\n'):
+                    break  # ligne en cours d'écriture : reprise à la prochaine ingestion
+                offset += len(raw)
+                record = self._parse(raw)
+                if record is not None:
+                    batch.append(record)
+                if len(batch) >= BATCH_SIZE:
+                    added += self._commit(connection, file_path, offset, batch)
+                    batch = []
+        added += self._commit(connection, file_path, offset, batch)
+        return added
+
+    @staticmethod
+    def _parse(raw: bytes):
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return None  # ligne corrompue : ignorée
+        return (
+            data.get('jenkins_build_tag') or 'N/A',
+            data.get('jenkins_job_name') or 'N/A',
+            data.get('timestamp', ''),
+            data.get('suite_name', ''),
+            data.get('test_name', ''),
+            data.get('test_status', ''),
+            int(data.get('test_elapsed') or 0),
+            data.get('test_message'),
+            ','.join(data.get('test_tags') or ()),
+        )
+
+    @staticmethod
+    def _commit(connection, file_path: str, offset: int, batch: list) -> int:
+        # insertion et position dans la même transaction : une ingestion interrompue reprend proprement
+        with connection:
+            connection.executemany('INSERT INTO results (build_tag, job_name, timestamp, suite_name, test_name, '
+                                   'status, elapsed, message, tags) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', batch)
+            connection.execute('INSERT INTO ingested_files (path, offset) VALUES (?, ?) '
+                               'ON CONFLICT(path) DO UPDATE SET offset = excluded.offset', (file_path, offset))
+        return len(batch)
+
+    # ---------- analyses ----------
+    def _runs_by_test(self, max_rank: int, test=None):
+        """Itère sur (suite, test, exécutions du plus récent au plus ancien), limité à `max_rank` par test."""
+        where, params = '', ()
+        if test:
+            where, params = 'WHERE test_name = ?', (test,)
+        query = (f"SELECT suite_name, test_name, build_tag, timestamp, status, elapsed FROM "
+                 f"({_RANKED_RUNS.format(where=where)}) WHERE run_rank <= ? ORDER BY suite_name, test_name, run_rank")
+        with closing(self._connect()) as connection:
+            current, runs = None, []
+            for suite, name, build_tag, timestamp, status, elapsed in connection.execute(query, (*params, max_rank)):
+                if (suite, name) != current:
+                    if runs:
+                        yield current[0], current[1], runs
+                    current, runs = (suite, name), []
+                runs.append({'build_tag': build_tag, 'timestamp': timestamp, 'status': status, 'elapsed': elapsed})
+            if runs:
+                yield current[0], current[1], runs
+
+    def get_duration_trends(self, test=None, window=10) -> list:
+        """Retourne, par test, la durée médiane des `window` dernières exécutions réussies et celle des `window` précédentes.
+
+        Seules les exécutions PASS ont une durée (les échecs sont audités à 0 ms).
+
+        Examples:
+        | ${tendances}= | Get Duration Trends | window=5 |
+        """
+        window = int(window)
+        trends = []
+        for suite, name, runs in self._runs_by_test(4 * window, test):
+            durations = [run['elapsed'] for run in runs if run['status'] == 'PASS']
+            recent, baseline = durations[:window], durations[window:2 * window]
+            if not recent:
+                continue
+            recent_median = statistics.median(recent)
+            baseline_median = statistics.median(baseline) if baseline else None
+            trends.append({
+                'suite_name': suite,
+                'test_name': name,
+                'runs': len(recent),
+                'recent_median_ms': recent_median,
+                'baseline_median_ms': baseline_median,
+                'change_pct': _percent(recent_median / baseline_median - 1) if baseline_median else None,
+                'last_build': runs[0]['build_tag'],
+            })
+        return trends
+
+    def get_slowdowns(self, threshold=0.2, window=10) -> list:
+        """Retourne les tests dont la durée médiane récente dépasse la référence de plus de `threshold` (0.2 = +20 %).
+
+        Examples:
+        | ${ralentis}= | Get Slowdowns | threshold=0.3 |
+        """
+        threshold = float(threshold)
+        slowdowns = [trend for trend in self.get_duration_trends(window=window)
+                     if trend['change_pct'] is not None and trend['change_pct'] > _percent(threshold)]
+        return sorted(slowdowns, key=lambda trend: trend['change_pct'], reverse=True)
+
+    def get_flaky_tests(self, window=50, min_rate=0.05) -> list:
+        """Retourne les tests instables sur leurs `window` dernières exécutions.
+
+        Un test est instable s'il a à la fois réussi et échoué ; `flip_rate` est la proportion
+        de changements de statut d'une exécution à la suivante. Seuls les tests dont le taux
+        d'échec atteint `min_rate` sont retournés, triés par `flip_rate` décroissant.
+
+        Examples:
+        | ${instables}= | Get Flaky Tests | window=20 |
+        """
+        flaky = []
+        for suite, name, runs in self._runs_by_test(int(window)):
+            statuses = [run['status'] for run in runs if run['status'] in ('PASS', 'FAIL')]
+            failures = statuses.count('FAIL')
+            if not failures or failures == len(statuses):
+                continue
+            fail_rate = failures / len(statuses)
+            if fail_rate < float(min_rate):
+                continue
+            flips = sum(1 for previous, current in zip(statuses, statuses[1:]) if previous != current)
+            flaky.append({
+                'suite_name': suite,
+                'test_name': name,
+                'runs': len(statuses),
+                'fail_rate_pct': _percent(fail_rate),
+                'flip_rate_pct': _percent(flips / (len(statuses) - 1)),
+                'last_status': statuses[0],
+            })
+        return sorted(flaky, key=lambda test: (test['flip_rate_pct'], test['fail_rate_pct']), reverse=True)
+
+
+def _print_table(rows: list) -> None:
+    if not rows:
+        print("Aucun résultat.")
+        return
+    columns = list(rows[0])
+    widths = {c: max(len(c), *(len(str(row[c])) for row in rows)) for c in columns}
+    print("  ".join(f"{c:<{widths[c]}}" for c in columns))
+    print("  ".join("-" * widths[c] for c in columns))
+    for row in rows:
+        print("  ".join(f"{str(row[c]):<{widths[c]}}" for c in columns))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Historique des exécutions à partir des audits NDJSON")
+    parser.add_argument('--db', default=None, help="base SQLite (défaut: RUN_HISTORY_DB ou WORKSPACE/run_history.sqlite)")
+    parser.add_argument('--json', action='store_true', help="sortie JSON")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help="ingérer les nouveaux enregistrements NDJSON")
+    ingest.add_argument('paths', nargs='*', help="fichiers .ndjson ou répertoires (défaut: WORKSPACE)")
+    trends = commands.add_parser('trends', help="tendance des durées par test")
+    trends.add_argument('--test', default=None)
+    trends.add_argument('--window', type=int, default=10)
+    slowdowns = commands.add_parser('slowdowns', help="tests ralentis au-delà d'un seuil")
+    slowdowns.add_argument('--threshold', type=float, default=0.2)
+    slowdowns.add_argument('--window', type=int, default=10)
+    flaky = commands.add_parser('flaky', help="tests instables")
+    flaky.add_argument('--window', type=int, default=50)
+    flaky.add_argument('--min-rate', type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    history = RunHistory(args.db)
+    if args.command == 'ingest':
+        print(f"{history.ingest_run_history(*args.paths)} enregistrement(s) ingéré(s) dans {history.database}")
+        return 0
+    if args.command == 'trends':
+        rows = history.get_duration_trends(args.test, args.window)
+    elif args.command == 'slowdowns':
+        rows = history.get_slowdowns(args.threshold, args.window)
+    else:
+        rows = history.get_flaky_tests(args.window, args.min_rate)
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        _print_table(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
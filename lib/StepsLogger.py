@@ -1,9 +1,13 @@
-
 # -*- coding: utf-8 -*-
 """Logger d'étapes pour Robot Framework, format ISO 8601 Z + couleurs ANSI."""
 
+import atexit
+import os
+import queue
 import sys
 import io
+import threading
+import time
 from robot.api import logger
 from datetime import datetime, timezone
 
@@ -52,6 +56,206 @@ LEVELS = {
     "test":    ("INFO ",   ""),            # couleur neutre (peut être bleue si souhaité)
 }
 
+class LogSink:
+    """Puits d'écriture asynchrone pour un fichier de log.
+
+    Le thread de test se contente de déposer la ligne dans une file bornée ;
+    un unique thread d'écriture vide la file par lots et flush périodiquement.
+    Options (variables d'environnement) :
+      - STEPS_LOGGER_SINK: 'async' (défaut) ou 'sync' (écriture directe, pour debug)
+      - STEPS_LOGGER_QUEUE_SIZE: taille max de la file (défaut: 10000)
+      - STEPS_LOGGER_QUEUE_POLICY: 'block' (défaut, back-pressure) ou 'drop' (ligne ignorée si file pleine)
+      - STEPS_LOGGER_FLUSH_INTERVAL: intervalle en secondes des écritures par lot (défaut: 0.5)
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, mode: str = "async", queue_size: int = 10000,
+                 policy: str = "block", flush_interval: float = 0.5):
+        self.path = path
+        self.mode = mode.lower()
+        self.policy = policy.lower()
+        self.flush_interval = max(0.01, float(flush_interval))
+        self._queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        self.lines_written = 0
+        self.lines_dropped = 0
+        self.lines_failed = 0
+        self.flush_count = 0
+        self.flush_total_ms = 0.0
+        self.flush_max_ms = 0.0
+
+        # Vider le fichier de log au démarrage (une seule fois par processus et par fichier)
+        try:
+            with open(self.path, 'w', encoding='utf-8'):
+                pass  # Fichier tronqué vide
+        except Exception:
+            pass  # Silencieusement ignorer les erreurs
+
+    @classmethod
+    def from_environment(cls, path: str) -> "LogSink":
+        return cls(path,
+                   mode=os.environ.get('STEPS_LOGGER_SINK', 'async'),
+                   queue_size=int(os.environ.get('STEPS_LOGGER_QUEUE_SIZE', 10000)),
+                   policy=os.environ.get('STEPS_LOGGER_QUEUE_POLICY', 'block'),
+                   flush_interval=float(os.environ.get('STEPS_LOGGER_FLUSH_INTERVAL', 0.5)))
+
+    def write(self, line: str) -> None:
+        if self.mode == "sync":
+            self._write_lines([line])
+            return
+        # Sous verrou : une ligne ne peut pas être déposée derrière le marqueur d'arrêt d'un close() concurrent
+        with self._start_lock:
+            if self._thread is None:
+                self._start()
+            if self.policy == "drop":
+                try:
+                    self._queue.put_nowait(line)
+                except queue.Full:
+                    self.lines_dropped += 1
+            else:
+                self._queue.put(line)
+
+    def flush(self) -> None:
+        """Attend que les lignes déjà déposées soient écrites dans le fichier (le thread continue)."""
+        with self._start_lock:
+            if self._thread is None:
+                return
+            done = threading.Event()
+            self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        """Vide la file et arrête le thread d'écriture (redémarré au besoin)."""
+        with self._start_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(self._STOP)
+            thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "lines_written": self.lines_written,
+            "lines_dropped": self.lines_dropped,
+            "lines_failed": self.lines_failed,
+            "queued": self._queue.qsize(),
+            "flush_count": self.flush_count,
+            "flush_avg_ms": round(self.flush_total_ms / self.flush_count, 3) if self.flush_count else 0.0,
+            "flush_max_ms": round(self.flush_max_ms, 3),
+        }
+
+    # ---------- thread d'écriture ----------
+    def _start(self) -> None:
+        # appelé sous _start_lock
+        self._thread = threading.Thread(target=self._run, name="StepsLoggerSink", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            handle = open(self.path, 'a', encoding='utf-8')
+        except Exception:
+            handle = None
+        batch = []
+        last_flush = time.monotonic()
+        stop = False
+        flushed = []  # marqueurs de flush() à signaler une fois le lot écrit
+        while not stop:
+            # Lignes en attente : on n'attend que le reste de l'intervalle avant de les écrire
+            timeout = self.flush_interval
+            if batch:
+                timeout = max(0.0, last_flush + self.flush_interval - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            # Drainer ce qui est déjà en file pour écrire par lots
+            while item is not None:
+                if item is self._STOP:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    flushed.append(item)
+                else:
+                    batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            now = time.monotonic()
+            # Écriture par lots : au plus un flush par intervalle, sauf arrêt, flush() ou lot de la taille de la file
+            if batch and (stop or flushed or now - last_flush >= self.flush_interval
+                          or len(batch) >= self._queue.maxsize):
+                self._flush(handle, batch)
+                batch = []
+                last_flush = now
+            for done in flushed:
+                done.set()
+            flushed = []
+        if handle is not None:
+            handle.close()
+
+    def _flush(self, handle, batch) -> None:
+        started = time.perf_counter()
+        written = False
+        if handle is not None:
+            try:
+                handle.write('\n'.join(batch) + '\n')
+                handle.flush()
+                written = True
+            except Exception:
+                pass  # Silencieusement ignorer les erreurs d'écriture de log
+        self._record_flush(len(batch), started, written)
+
+    def _write_lines(self, lines) -> None:
+        started = time.perf_counter()
+        written = False
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            written = True
+        except Exception:
+            pass  # Silencieusement ignorer les erreurs d'écriture de log
+        self._record_flush(len(lines), started, written)
+
+    def _record_flush(self, count: int, started: float, written: bool) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        # Fichier non ouvert ou écriture en erreur : lignes comptées en échec, pas en écrites
+        if written:
+            self.lines_written += count
+        else:
+            self.lines_failed += count
+        self.flush_count += 1
+        self.flush_total_ms += elapsed_ms
+        if elapsed_ms > self.flush_max_ms:
+            self.flush_max_ms = elapsed_ms
+
+
+# Un seul puits par fichier pour tout le processus (StepsLogger est aussi instancié par ReporterLibrary)
+_SINKS: dict = {}
+_SINKS_LOCK = threading.Lock()
+
+
+def get_log_sink(path: str) -> LogSink:
+    """Retourne le puits associé au fichier, créé (et le fichier tronqué) au premier appel."""
+    path = os.path.abspath(path)
+    with _SINKS_LOCK:
+        sink = _SINKS.get(path)
+        if sink is None:
+            sink = LogSink.from_environment(path)
+            _SINKS[path] = sink
+        return sink
+
+
+@atexit.register
+def _close_log_sinks() -> None:
+    for sink in list(_SINKS.values()):
+        sink.close()
+
+
 class StepsLogger:
     """Lib Python pour Robot Framework.
     Options:
@@ -78,128 +282,151 @@ class StepsLogger:
         self.is_windows = platform.system() == 'Windows'
         self.emoji_in_console = emoji and not self.is_windows
         
-        # Initialiser le fichier de log
-        import os
+        # Initialiser le fichier de log (tronqué à la création du puits, voir LogSink)
         self.log_file_path = os.path.join(os.environ.get('WORKSPACE', '.'), 'StepsLogger.log')
-        
-        # Vider le fichier de log au démarrage
-        try:
-            with open(self.log_file_path, 'w', encoding='utf-8') as f:
-                pass  # Fichier tronqué vide
-        except Exception:
-            pass  # Silencieusement ignorer les erreurs
+        self._sink = get_log_sink(self.log_file_path)
+
+        # Gabarits de lignes précalculés (recalculés par set_options)
+        self._compile_formats()
 
     # ---------- helpers ----------
+    def _compile_formats(self) -> None:
+        """Précalcule les gabarits par (catégorie, libellé) et réinitialise le cache d'horodatage."""
+        self._formats = {}
+        for category in LEVELS:
+            if category in INDENT:
+                self._compile_format(category, category.upper())
+            else:
+                # success / error : libellé = catégorie de la couche appelante
+                for label in INDENT:
+                    self._compile_format(category, label.upper())
+        self._ts_second = None
+        self._ts_prefix = ""
+        self._ts_suffix = ""
+
+    def _compile_format(self, category: str, label: str) -> tuple:
+        """Construit le gabarit (niveau, préfixe fichier, gabarit console) d'une catégorie.
+
+        Le préfixe fichier se place après l'horodatage : ' [LEVEL] {indent}{emoji }LABEL: '.
+        Le gabarit console (couleur, préfixe, reset) n'est construit que si colored_console est actif.
+        """
+        level, color_code = LEVELS.get(category, ("INFO ", ""))
+        emoji_sym = EMOJI.get(category, "")
+        indent = INDENT.get(label.lower(), "")
+        file_prefix = f" [{level}] {indent}{(emoji_sym + ' ') if (self.emoji and emoji_sym) else ''}{label}: "
+
+        console = None
+        if self.colored_console:
+            # Message console SANS emojis sur Windows (pour éviter les ?)
+            console_prefix = file_prefix if self.emoji_in_console else f" [{level}] {label}: "
+            if self.color and color_code:
+                console = (color_code, console_prefix, ANSI['reset'])
+            else:
+                console = ("", console_prefix, "")
+
+        fmt = (level, file_prefix, console)
+        self._formats[(category, label)] = fmt
+        return fmt
+
     def _timestamp_iso_z(self) -> str:
         # UTC ou LOCAL (inclut l'offset si LOCAL)
-        if self.tz == "UTC":
-            now = datetime.now(timezone.utc)
-            if self.ms3:
-                # %f => microsecondes (6 digits). On tronque à 3 pour ms.
-                base = now.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
-                return f"{base}Z"
-            else:
-                return now.strftime("%Y-%m-%dT%H:%M:%SZ")
-        else:
-            now = datetime.now().astimezone()
-            if self.ms3:
-                base = now.strftime("%Y-%m-%dT%H:%M:%S.%f%z")
-                return f"{base[:-5]}{base[-5:-3]}:{base[-3:]}"  # RFC3339 offset + ms
+        # La partie à la seconde est mise en cache, seules les millisecondes sont ajoutées à chaque appel.
+        now = time.time()
+        second = int(now)
+        if second != self._ts_second:
+            if self.tz == "UTC":
+                self._ts_prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+                self._ts_suffix = "Z"
             else:
-                base = now.strftime("%Y-%m-%dT%H:%M:%S%z")
-                return f"{base[:-5]}{base[-5:-3]}:{base[-3:]}"  #  +hh:mm
+                local = datetime.fromtimestamp(second).astimezone()
+                offset = local.strftime("%z")
+                self._ts_prefix = local.strftime("%Y-%m-%dT%H:%M:%S")
+                self._ts_suffix = f"{offset[:3]}:{offset[3:5]}"  # RFC3339 +hh:mm
+            self._ts_second = second
+        if self.ms3:
+            return f"{self._ts_prefix}.{int((now - second) * 1000):03d}{self._ts_suffix}"
+        return self._ts_prefix + self._ts_suffix
 
-    def _emit(self, category: str, msg: str, level: str, color_code: str,
-              emoji_override: str = None, label_override: str = None):
-        ts = self._timestamp_iso_z()
-        emoji_sym = emoji_override if emoji_override is not None else EMOJI.get(category, "")
-        label = label_override if label_override else category.upper()
-        indent = INDENT.get(label.lower(), "")
-        # logger.debug(f"label='{label}',category='{category}', indent='{indent}'; emoji='{emoji_sym}")
+    def _emit(self, category: str, msg: str, label: str = None):
+        label = label.upper() if label else category.upper()
+        fmt = self._formats.get((category, label))
+        if fmt is None:
+            fmt = self._compile_format(category, label)
+        level, file_prefix, console = fmt
 
-        # Message avec emojis (pour HTML et logs)
-        msg_with_emoji = str(msg).encode('utf-8', errors='replace').decode('utf-8')
-        file_line = f"{ts} [{level}] {indent}" \
-                    f"{(emoji_sym + ' ') if (self.emoji and emoji_sym) else ''}" \
-                    f"{label}: {msg_with_emoji}"
-        
-        # Message console SANS emojis sur Windows (pour éviter les ?)
-        if self.emoji_in_console:
-            console_line = file_line
-        else:
-            console_line = f"{ts} [{level}] {label}: {msg_with_emoji}"
+        # Message avec emojis (pour HTML et logs) ; ré-encodage uniquement hors ASCII
+        text = msg if type(msg) is str else str(msg)
+        if not text.isascii():
+            text = text.encode('utf-8', errors='replace').decode('utf-8')
 
-        # Appliquer la couleur si activée
-        if self.color and color_code:
-            console_line = f"{color_code}{console_line}{ANSI['reset']}"
+        ts = self._timestamp_iso_z()
+        file_line = ts + file_prefix + text
 
         # Écritures selon le niveau
         if level == "ERROR":
             logger.error(file_line)                # log + console automatique (RF)
-            if self.colored_console:
-                logger.console(console_line)
         elif level == "WARN":
             logger.warn(file_line)                 # log + console automatique (RF)
-            if self.colored_console:
-                logger.console(console_line)
         elif level == "DEBUG":
             logger.debug(file_line)                # log uniquement
-            if self.colored_console:
-                logger.console(console_line)
         else:  # INFO / TRACE
             logger.info(file_line)                 # log
-            if self.colored_console:
-                logger.console(console_line)
-            else:
+            if console is None:
                 # afficher aussi en console sans couleur
                 logger.info(file_line, also_console=True)
-        
+
+        # Ligne colorée construite uniquement si colored_console est actif
+        if console is not None:
+            color_code, console_prefix, reset = console
+            logger.console(color_code + ts + console_prefix + text + reset)
+
         # Écrire dans le fichier de log
         self._write_to_log_file(file_line)
 
     def _write_to_log_file(self, line: str) -> None:
-        """Écrit une ligne dans le fichier de log en UTF-8."""
-        try:
-            with open(self.log_file_path, 'a', encoding='utf-8') as f:
-                f.write(line + '\n')
-        except Exception as e:
-            # Silencieusement ignorer les erreurs d'écriture de log
-            pass
+        """Dépose une ligne pour le fichier de log (écrite en UTF-8 par le thread du puits)."""
+        self._sink.write(line)
 
     # ---------- API (keywords côté Robot) ----------
     def test(self, message: str):
         """🧪 TEST: … (INFO)."""
-        level, color = LEVELS["test"]
-        self._emit("test", message, level, color, EMOJI["test"], label_override="TEST")
+        self._emit("test", message)
 
     def step(self, message: str):
         """  ➡️ STEP: … (INFO, bleu)."""
-        level, color = LEVELS["step"]
-        self._emit("step", message, level, color, EMOJI["step"], label_override="STEP")
+        self._emit("step", message)
 
     def success(self, message: str, category: str = "STEP"):
         """✅ {category}: … (INFO, vert)."""
-        level, color = LEVELS["success"]
-        self._emit("success", message, level, color, EMOJI["success"], label_override=category.upper())
+        self._emit("success", message, category)
 
     def error(self, message: str, category: str = "STEP"):
         """❌ ERROR: … (ERROR, rouge)."""
-        level, color = LEVELS["error"]
-        self._emit("error", message, level, color, EMOJI["error"], label_override=category.upper())
+        self._emit("error", message, category)
 
     def service(self, message: str):
         """    🛠️ SERVICE: {message} (INFO, magenta)."""
-        level, color = LEVELS["service"]
-        self._emit("service", message, level, color, EMOJI["service"], label_override="SERVICE")
+        self._emit("service", message)
     def page(self, message: str):
         """      📄 PAGE: … (INFO, magenta)."""
-        level, color = LEVELS["page"]
-        self._emit("page", message, level, color, EMOJI["page"], label_override="PAGE")
+        self._emit("page", message)
 
     def socle(self, message: str):
         """⚙️ SOCLE: … (DEBUG, gris)."""
-        level, color = LEVELS["socle"]
-        self._emit("socle", message, level, color, EMOJI["socle"], label_override="SOCLE")
+        self._emit("socle", message)
+
+    def get_log_sink_stats(self) -> dict:
+        """Statistiques du fichier de log : lignes écrites, ignorées, en échec, en file et latence des flush (ms).
+
+        Exemple:
+        | ${stats}= | Get Log Sink Stats |
+        | Log | ${stats}[lines_dropped] |
+        """
+        return self._sink.stats()
+
+    def flush_log_file(self):
+        """Force l'écriture des lignes en attente dans le fichier de log."""
+        self._sink.flush()
 
     # Modif des options à la volée
     def set_options(self, tz: str = None, ms3: bool = None, color: bool = None,
@@ -214,3 +441,5 @@ class StepsLogger:
             self.emoji = bool(emoji)
         if colored_console is not None:
             self.colored_console = bool(colored_console)
+        self.emoji_in_console = self.emoji and not self.is_windows
+        self._compile_formats()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Librairie Robot Framework de cache des sessions authentifiées (storage state Playwright).
+
+Après une première connexion réussie d'un utilisateur, l'état du navigateur
+(cookies, localStorage) est sauvegardé par (environnement, utilisateur) dans
+WORKSPACE. Les scénarios suivants démarrent un nouveau contexte depuis cet état
+au lieu de repasser par la page de login.
+
+Un état est ignoré puis supprimé :
+  - s'il est plus ancien que `ttl`
+  - si un de ses cookies a expiré
+  - s'il est invalidé explicitement (session refusée par l'application)
+
+Les tests portant un tag de contournement (par défaut CU00, les tests du login)
+n'utilisent jamais le cache.
+
+Variables d'environnement :
+  - STORAGE_STATE_CACHE: active le cache (défaut: true)
+  - STORAGE_STATE_DIR: répertoire du cache (défaut: WORKSPACE/.storage_state), partagé par les workers parallèles
+  - STORAGE_STATE_TTL: durée de validité d'un état, en secondes (défaut: 1800)
+  - STORAGE_STATE_BYPASS_TAGS: tags qui contournent le cache, séparés par des virgules (défaut: CU00)
+
+Les fichiers d'état contiennent des cookies de session : le répertoire du cache
+(WORKSPACE/.storage_state) ne doit pas être archivé avec les rapports.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from robot.libraries.BuiltIn import BuiltIn
+from robot.utils import normalize
+
+from LibraryUtils import atomic_path, to_bool
+
+# Marge de sécurité sur l'expiration des cookies (secondes)
+COOKIE_EXPIRY_MARGIN = 60
+
+
+class StorageStateCache:
+    """Cache des états d'authentification par (environnement, utilisateur).
+
+    Options:
+      - environment: environnement des sessions (défaut: variable d'environnement MY_ENV)
+      - cache_dir: répertoire du cache (défaut: STORAGE_STATE_DIR, sinon WORKSPACE/.storage_state)
+      - ttl: durée de validité d'un état en secondes (défaut: STORAGE_STATE_TTL, sinon 1800)
+      - bypass_tags: tags qui contournent le cache (défaut: STORAGE_STATE_BYPASS_TAGS, sinon CU00)
+      - enabled: active le cache (défaut: STORAGE_STATE_CACHE, sinon true)
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    def __init__(self, environment=None, cache_dir=None, ttl=None, bypass_tags=None, enabled=None):
+        self.environment = environment or os.environ.get('MY_ENV', 'default')
+        self.cache_dir = cache_dir or os.environ.get('STORAGE_STATE_DIR') or os.path.join(
+            os.environ.get('WORKSPACE', '.'), '.storage_state')
+        self.ttl = float(ttl if ttl is not None else os.environ.get('STORAGE_STATE_TTL', 1800))
+        bypass_tags = bypass_tags if bypass_tags is not None else os.environ.get('STORAGE_STATE_BYPASS_TAGS', 'CU00')
+        self.bypass_tags = {normalize(tag) for tag in str(bypass_tags).split(',') if tag.strip()}
+        self.enabled = to_bool(enabled if enabled is not None else os.environ.get('STORAGE_STATE_CACHE', 'true'))
+
+    def _path(self, user):
+        digest = hashlib.sha1(f"{self.environment}:{user}".encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{self.environment}_{digest}.json")
+
+    def storage_state_cache_enabled(self) -> bool:
+        """Retourne True si le cache peut être utilisé par le test en cours.
+
+        Faux si le cache est désactivé ou si le test porte un tag de contournement (ex: CU00).
+        """
+        if not self.enabled:
+            return False
+        tags = BuiltIn().get_variable_value('@{TEST TAGS}', [])
+        return not any(normalize(tag) in self.bypass_tags for tag in tags)
+
+    def get_cached_storage_state(self, user):
+        """Retourne le chemin de l'état d'authentification valide de l'utilisateur, sinon None.
+
+        Examples:
+        | ${etat}= | Get Cached Storage State | user1@develop.sample.fr |
+        """
+        if not self.storage_state_cache_enabled():
+            return None
+        path = self._path(user)
+        try:
+            age = time.time() - os.path.getmtime(path)
+            with open(path, encoding='utf-8') as stream:
+                state = json.load(stream)
+        except (OSError, ValueError):
+            return None
+
+        limit = time.time() + COOKIE_EXPIRY_MARGIN
+        expired_cookie = any(0 < cookie.get('expires', -1) < limit for cookie in state.get('cookies', ()))
+        if age > self.ttl or expired_cookie:
+            self.invalidate_storage_state(user)
+            return None
+        return path
+
+    def save_storage_state(self, user, source):
+        """Enregistre dans le cache l'état d'authentification `source` (fichier JSON) de l'utilisateur.
+
+        Examples:
+        | ${source}= | Browser.Save Storage State |
+        | Save Storage State | user1@develop.sample.fr | ${source} |
+        """
+        if not self.enabled:
+            return None
+        path = self._path(user)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # plusieurs workers peuvent enregistrer le même utilisateur
+        with atomic_path(path) as temp_path:
+            shutil.copyfile(source, temp_path)
+        return path
+
+    def invalidate_storage_state(self, user):
+        """Supprime l'état d'authentification de l'utilisateur (expiré ou refusé par l'application)."""
+        try:
+            os.remove(self._path(user))
+        except FileNotFoundError:
+            pass
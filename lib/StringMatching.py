@@ -8,6 +8,12 @@ Objectif
 
 Dépendances: uniquement la bibliothèque standard Python (difflib, unicodedata, re).
 
+Scores disponibles (argument ``scorer``) :
+- ``difflib`` (défaut) : difflib.SequenceMatcher.ratio
+- ``levenshtein`` : 1 - distance d'édition / longueur max
+- ``damerau`` : idem avec transpositions de caractères adjacents (distance OSA)
+- ``token_set`` : comparaison des ensembles de mots, insensible à l'ordre des mots
+
 Utilisation Robot (exemple)
 --------------------------
 *** Settings ***
@@ -25,7 +31,8 @@ from robot.api.deco import library, keyword
 import difflib
 import re
 import unicodedata
-from typing import Iterable, List, Mapping, Sequence, Tuple, Union, Any
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union, Any
 
 _Text = Union[str, bytes]
 
@@ -38,20 +45,315 @@ def _to_str(value: Any) -> str:
     return str(value)
 
 
-def _strip_accents(text: str) -> str:
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _strip_accents_slow(text: str) -> str:
     # NFD décompose les caractères accentués en (lettre + diacritique)
     # On supprime ensuite les diacritiques (category == 'Mn').
     decomposed = unicodedata.normalize("NFD", text)
     return "".join(ch for ch in decomposed if unicodedata.category(ch) != "Mn")
 
+
+# Table de traduction Latin-1 -> sans accents, dérivée de la version NFD (résultat identique).
+_LATIN1_ACCENTS = {
+    code: _strip_accents_slow(chr(code))
+    for code in range(0x80, 0x100)
+    if _strip_accents_slow(chr(code)) != chr(code)
+}
+
+
+def _strip_accents(text: str) -> str:
+    if text.isascii():
+        return text
+    # Chemin rapide: texte purement Latin-1 (cas des libellés français)
+    if max(text) <= "\xff":
+        return text.translate(_LATIN1_ACCENTS)
+    return _strip_accents_slow(text)
+
+
+class _LruCache:
+    """Cache borné à éviction LRU, avec compteurs pour le réglage de sa taille."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(0, int(maxsize))
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Any) -> Any:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+# Cache partagé entre toutes les instances créées avec shared_cache=True
+_SHARED_NORM_CACHE = None
+
+
+# ---------- scores de similarité ----------
+# Interface commune: ratio(a, b, cutoff) -> float dans [0, 1].
+# Si le score réel est inférieur à `cutoff`, la fonction peut s'arrêter tôt et retourner 0.0 ;
+# un score >= cutoff est toujours retourné exactement.
+
+def _ratio_difflib(a, b, cutoff: float = 0.0) -> float:
+    matcher = difflib.SequenceMatcher(None, a, b)
+    if cutoff > 0.0 and (matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff):
+        return 0.0
+    return matcher.ratio()
+
+
+def _edit_distance(a, b, max_dist: int, transpositions: bool = False) -> int:
+    """Distance de Levenshtein (ou OSA si transpositions), arrêt dès que max_dist est dépassé."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    before = previous
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if transpositions and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, before[j - 2] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_dist:
+            return max_dist + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+def _edit_ratio(a, b, cutoff: float, transpositions: bool) -> float:
+    longest = max(len(a), len(b))
+    if longest == 0:
+        return 1.0
+    # ratio >= cutoff  <=>  distance <= (1 - cutoff) * longest
+    max_dist = int((1.0 - cutoff) * longest + 1e-9) if cutoff > 0.0 else longest
+    if abs(len(a) - len(b)) > max_dist:
+        return 0.0
+    distance = _edit_distance(a, b, max_dist, transpositions)
+    if distance > max_dist:
+        return 0.0
+    return 1.0 - distance / longest
+
+
+def _ratio_levenshtein(a, b, cutoff: float = 0.0) -> float:
+    return _edit_ratio(a, b, cutoff, transpositions=False)
+
+
+def _ratio_damerau(a, b, cutoff: float = 0.0) -> float:
+    return _edit_ratio(a, b, cutoff, transpositions=True)
+
+
+def _ratio_token_set(a, b, cutoff: float = 0.0) -> float:
+    # Mots communs triés + mots propres à chaque côté (à la manière de fuzzywuzzy.token_set_ratio)
+    tokens_a, tokens_b = set(_to_str(a).split()), set(_to_str(b).split())
+    common = " ".join(sorted(tokens_a & tokens_b))
+    combined_a = " ".join(filter(None, (common, " ".join(sorted(tokens_a - tokens_b)))))
+    combined_b = " ".join(filter(None, (common, " ".join(sorted(tokens_b - tokens_a)))))
+    if not combined_a and not combined_b:
+        return 1.0
+    scores = [difflib.SequenceMatcher(None, combined_a, combined_b).ratio()]
+    if common:
+        scores.append(difflib.SequenceMatcher(None, common, combined_a).ratio())
+        scores.append(difflib.SequenceMatcher(None, common, combined_b).ratio())
+    return max(scores)
+
+
+def _edit_length_bound(len_a: int, len_b: int) -> float:
+    longest = max(len_a, len_b)
+    return 1.0 - abs(len_a - len_b) / longest if longest else 1.0
+
+
+class _Scorer(NamedTuple):
+    name: str
+    ratio: Callable[[Any, Any, float], float]
+    # borne supérieure du score d'après les seules longueurs (None si aucune)
+    length_bound: Optional[Callable[[int, int], float]]
+
+
+SCORERS: Dict[str, _Scorer] = {
+    "difflib": _Scorer("difflib", _ratio_difflib, lambda la, lb: 2.0 * min(la, lb) / (la + lb) if la + lb else 1.0),
+    "levenshtein": _Scorer("levenshtein", _ratio_levenshtein, _edit_length_bound),
+    "damerau": _Scorer("damerau", _ratio_damerau, _edit_length_bound),
+    "token_set": _Scorer("token_set", _ratio_token_set, None),
+}
+
+
+def _cutoff(best_score: float, second_score: float, threshold: float, ambiguity_delta: float) -> float:
+    """Score en dessous duquel un candidat ne peut plus changer le résultat d'une recherche.
+
+    Tant que le seuil n'est pas atteint seul le meilleur score compte (message d'erreur) ;
+    ensuite un candidat n'importe que s'il peut rendre le match ambigu ou devenir second.
+    """
+    if best_score < threshold:
+        return max(second_score, best_score)
+    return max(second_score, best_score - ambiguity_delta - 1e-9)
+
+def _trigrams(text) -> set:
+    # Les textes courts (< 3) sont indexés tels quels pour rester retrouvables.
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _bound(matches: int, total: int) -> float:
+    # Même formule que difflib (_calculate_ratio) pour que la borne soit comparable au score exact.
+    return 2.0 * matches / total if total else 1.0
+
+
+class _CandidateIndex:
+    """Liste de candidats pré-indexée pour des requêtes répétées.
+
+    Précalcule une fois par candidat : forme normalisée, longueur, multiset de
+    caractères et trigrammes. Les requêtes évaluent d'abord les candidats qui
+    partagent le plus de trigrammes avec l'attendu (pour obtenir vite un bon
+    meilleur score), puis élaguent le reste avec des bornes supérieures du ratio
+    difflib (longueurs puis caractères communs, cf. real_quick_ratio / quick_ratio)
+    avant tout calcul exact.
+    """
+
+    SEEDS = 8
+
+    def __init__(self, items: List[Any], norms: List[Any]):
+        self.items = items
+        self.norms = norms
+        self.chars = [Counter(n) for n in norms]
+        self.trigrams: Dict[Any, List[int]] = {}
+        self.buckets: Dict[int, List[int]] = {}
+        for i, norm in enumerate(norms):
+            for gram in _trigrams(norm):
+                self.trigrams.setdefault(gram, []).append(i)
+            self.buckets.setdefault(len(norm), []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def search(self, exp_norm, threshold: float, ambiguity_delta: float,
+               scorer: _Scorer = SCORERS["difflib"]) -> Tuple[Any, float, float]:
+        """Retourne (meilleur_candidat, meilleur_score, second_score), identiques à un parcours complet.
+
+        Seuls les scores pouvant changer le résultat sont calculés : un candidat est ignoré si sa
+        borne est inférieure au second score, au meilleur score tant que le seuil n'est pas atteint,
+        ou à (meilleur - ambiguity_delta) une fois le seuil atteint.
+        Les trigrammes et le multiset de caractères ne servent qu'au score difflib ; les autres
+        scores utilisent leur borne de longueur et leur propre arrêt anticipé.
+        """
+        threshold = float(threshold)
+        ambiguity_delta = float(ambiguity_delta)
+        if scorer.name != "difflib":
+            return self._scan(exp_norm, threshold, ambiguity_delta, scorer)
+
+        matcher = difflib.SequenceMatcher(None, "", exp_norm)
+        exp_len = len(exp_norm)
+        exp_chars = Counter(exp_norm)
+
+        # (score, index) du meilleur ; à score égal le premier candidat de la liste l'emporte
+        best_score, best_index, second_score = -1.0, -1, -1.0
+        seen = set()
+
+        def cutoff() -> float:
+            return _cutoff(best_score, second_score, threshold, ambiguity_delta)
+
+        def score(i: int) -> None:
+            nonlocal best_score, best_index, second_score
+            seen.add(i)
+            matcher.set_seq1(self.norms[i])
+            value = matcher.ratio()
+            if value > best_score or (value == best_score and i < best_index):
+                second_score = best_score
+                best_score, best_index = value, i
+            elif value > second_score:
+                second_score = value
+
+        overlap = Counter()
+        for gram in _trigrams(exp_norm):
+            for i in self.trigrams.get(gram, ()):
+                overlap[i] += 1
+        for i, _ in overlap.most_common(self.SEEDS):
+            score(i)
+
+        for length in sorted(self.buckets, key=lambda n: abs(n - exp_len)):
+            if _bound(min(length, exp_len), length + exp_len) < cutoff():
+                continue
+            for i in self.buckets[length]:
+                if i in seen:
+                    continue
+                chars = self.chars[i]
+                common = sum(min(count, exp_chars[ch]) for ch, count in chars.items())
+                if _bound(common, length + exp_len) < cutoff():
+                    continue
+                score(i)
+
+        return self.items[best_index], best_score, second_score
+
+    def _scan(self, exp_norm, threshold: float, ambiguity_delta: float, scorer: _Scorer) -> Tuple[Any, float, float]:
+        exp_len = len(exp_norm)
+        best_score, best_index, second_score = -1.0, -1, -1.0
+        for i, norm in enumerate(self.norms):
+            limit = _cutoff(best_score, second_score, threshold, ambiguity_delta)
+            if scorer.length_bound is not None and scorer.length_bound(len(norm), exp_len) < limit:
+                continue
+            value = scorer.ratio(norm, exp_norm, max(limit, 0.0))
+            if value > best_score:
+                second_score = best_score
+                best_score, best_index = value, i
+            elif value > second_score:
+                second_score = value
+        return self.items[best_index], best_score, second_score
+
+
 @library(scope='GLOBAL', version='0.1', doc_format='reST')
 class StringMatching:
     """Bibliothèque Robot Framework pour normaliser et comparer des chaînes."""
     ROBOT_LIBRARY_SCOPE = 'SUITE'
 
-    def __init__(self):
-        # Cache simple pour accélérer si on normalise souvent les mêmes chaînes.
-        self._norm_cache: dict[Tuple[str, bool, bool, bool], str] = {}
+    def __init__(self, cache_size: int = 4096, shared_cache: bool = False, debug: bool = False,
+                 scorer: str = "difflib"):
+        """
+        - cache_size: nombre max de textes normalisés gardés en cache (LRU, 0 = désactivé)
+        - shared_cache: partage le cache entre toutes les suites du processus
+        - debug: affiche chaque comparaison (coûteux sur de longues listes)
+        - scorer: score de similarité par défaut (difflib, levenshtein, damerau, token_set)
+        """
+        self.debug = bool(debug)
+        self.scorer = self._get_scorer(scorer).name
+        global _SHARED_NORM_CACHE
+        # Cache borné pour accélérer si on normalise souvent les mêmes chaînes.
+        if shared_cache:
+            if _SHARED_NORM_CACHE is None:
+                _SHARED_NORM_CACHE = _LruCache(cache_size)
+            _SHARED_NORM_CACHE.maxsize = max(_SHARED_NORM_CACHE.maxsize, int(cache_size))
+            self._norm_cache = _SHARED_NORM_CACHE
+        else:
+            self._norm_cache = _LruCache(cache_size)
+        # Index de candidats nommés (voir Register Candidate Index)
+        self._indexes: Dict[str, Tuple[_CandidateIndex, bool]] = {}
 
     @keyword("Normalize Text For Matching")
     def normalize_text_for_matching(
@@ -71,22 +373,31 @@ class StringMatching:
         - remove_accents: enlève les accents
         """
         s = _to_str(text)
-        cache_key = (s, to_lower, collapse_spaces, remove_accents)
-        if cache_key in self._norm_cache:
-            return self._norm_cache[cache_key]
+        cache_key = (s, to_lower, collapse_spaces, remove_accents, strip)
+        cached = self._norm_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         if strip:
             s = s.strip()
         if to_lower:
             s = s.lower()
         if collapse_spaces:
-            s = re.sub(r"\s+", " ", s)
+            s = _WHITESPACE_RE.sub(" ", s)
         if remove_accents:
             s = _strip_accents(s)
 
-        self._norm_cache[cache_key] = s
+        self._norm_cache.put(cache_key, s)
         return s
 
+    @keyword("Get Normalization Cache Stats")
+    def get_normalization_cache_stats(self) -> Dict[str, int]:
+        """Retourne les statistiques du cache de normalisation.
+
+        Clés: hits, misses, evictions, size (entrées actuelles), maxsize.
+        """
+        return self._norm_cache.stats()
+
     @keyword("Get Closest String")
     def get_closest_string(
         self,
@@ -96,12 +407,14 @@ class StringMatching:
         threshold: float = 0.72,
         ambiguity_delta: float = 0.05,
         normalize: bool = True,
+        scorer: Optional[str] = None,
     ) -> Tuple[str, float]:
         """Retourne (meilleur_candidat, score).
 
         - threshold: score minimal requis
         - ambiguity_delta: si best - second_best < delta => considéré ambigu
         - normalize: applique la normalisation avant scoring
+        - scorer: score de similarité (défaut: celui de la librairie, ``difflib``)
 
         Lève ValueError si aucun match fiable ou si ambigu.
         """
@@ -112,14 +425,20 @@ class StringMatching:
         exp = _to_str(expected)
         exp_norm = self.normalize_text_for_matching(exp) if normalize else exp
 
+        score_fn = self._get_scorer(scorer).ratio
+        threshold_value, delta_value = float(threshold), float(ambiguity_delta)
+
         best_item = ""
         best_score = -1.0
         second_score = -1.0
 
         for item in candidates:
-            print(f"Comparing '{exp}' to candidate '{item}'")
+            if self.debug:
+                print(f"Comparing '{exp}' to candidate '{item}'")
             item_norm = self.normalize_text_for_matching(item) if normalize else item
-            score = difflib.SequenceMatcher(None, item_norm, exp_norm).ratio()
+            # arrêt anticipé du score pour les candidats qui ne peuvent plus changer le résultat
+            limit = _cutoff(best_score, second_score, threshold_value, delta_value)
+            score = score_fn(item_norm, exp_norm, max(limit, 0.0))
             if score > best_score:
                 second_score = best_score
                 best_score = score
@@ -127,6 +446,180 @@ class StringMatching:
             elif score > second_score:
                 second_score = score
 
+        return self._check_match(exp, best_item, best_score, second_score, threshold, ambiguity_delta)
+
+    @keyword("Get Closest Strings")
+    def get_closest_strings(
+        self,
+        expected_values: Iterable[_Text],
+        candidates: Iterable[_Text],
+        *,
+        threshold: float = 0.72,
+        ambiguity_delta: float = 0.05,
+        normalize: bool = True,
+        one_to_one: bool = False,
+        strict: bool = True,
+        scorer: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Associe une liste de valeurs attendues aux candidats en un seul appel.
+
+        Chaque côté est normalisé une seule fois et la matrice des scores est calculée en une passe.
+        Retourne, dans l'ordre des attendus, un dictionnaire par valeur :
+        ``expected``, ``best`` (None si aucun), ``score``, ``second_score``, ``ambiguous``, ``matched``.
+
+        - threshold / ambiguity_delta / normalize: mêmes règles que ``Get Closest String``
+        - one_to_one: un candidat ne peut être attribué qu'à une seule valeur attendue
+          (affectation gloutonne par score décroissant ; l'ambiguïté est alors évaluée
+          parmi les candidats non attribués à une autre valeur)
+        - strict: lève ValueError listant les valeurs sans match fiable ou ambiguës
+        - scorer: score de similarité (défaut: celui de la librairie)
+
+        Exemple Robot::
+
+            @{attendus}=    Create List    Statut    Date de dépôt
+            @{colonnes}=    Create List    N° dossier    Statut    Déposé le    Date de dépôt
+            ${matches}=    Get Closest Strings    ${attendus}    ${colonnes}    one_to_one=True
+            Log    ${matches}[0][best]
+        """
+        expected_list = [_to_str(value) for value in expected_values]
+        candidate_list = list(candidates)
+        if not candidate_list:
+            raise ValueError("Liste de candidats vide")
+
+        exp_norms = [self.normalize_text_for_matching(e) if normalize else e for e in expected_list]
+        cand_norms = [self.normalize_text_for_matching(c) if normalize else c for c in candidate_list]
+
+        score_fn = self._get_scorer(scorer)
+        matrix: List[List[float]] = []
+        matcher = difflib.SequenceMatcher()
+        for exp, exp_norm in zip(expected_list, exp_norms):
+            matcher.set_seq2(exp_norm)
+            row = []
+            for item, item_norm in zip(candidate_list, cand_norms):
+                if self.debug:
+                    print(f"Comparing '{exp}' to candidate '{item}'")
+                if score_fn.name == "difflib":
+                    matcher.set_seq1(item_norm)
+                    row.append(matcher.ratio())
+                else:
+                    row.append(score_fn.ratio(item_norm, exp_norm, 0.0))
+            matrix.append(row)
+
+        threshold = float(threshold)
+        ambiguity_delta = float(ambiguity_delta)
+        if one_to_one:
+            choices = self._assign_one_to_one(matrix, threshold)
+        else:
+            # à score égal, le premier candidat de la liste l'emporte (comme Get Closest String)
+            choices = [max(range(len(row)), key=lambda j, r=row: (r[j], -j)) for row in matrix]
+
+        results = []
+        for i, exp in enumerate(expected_list):
+            row = matrix[i]
+            # seule l'affectation un-pour-un retire les candidats attribués aux autres valeurs
+            taken = {c for k, c in enumerate(choices) if k != i and c is not None} if one_to_one else set()
+            available = [j for j in range(len(row)) if j not in taken]
+            # sans affectation, on rapporte le meilleur candidat encore disponible
+            col = choices[i] if choices[i] is not None else max(available, key=lambda j: (row[j], -j), default=None)
+            score = row[col] if col is not None else -1.0
+            second = max((row[j] for j in available if j != col), default=-1.0)
+            matched = choices[i] is not None and score >= threshold
+            results.append({
+                "expected": exp,
+                "best": candidate_list[col] if matched else None,
+                "score": score,
+                "second_score": second,
+                "ambiguous": matched and (score - second) < ambiguity_delta,
+                "matched": matched,
+            })
+
+        if strict:
+            failures = [
+                f"'{r['expected']}' ({'ambigu' if r['ambiguous'] else 'aucun match fiable'}, score={r['score']:.3f})"
+                for r in results if not r["matched"] or r["ambiguous"]
+            ]
+            if failures:
+                raise ValueError(f"Correspondances non fiables (seuil={threshold}) : {', '.join(failures)}")
+
+        return results
+
+    @staticmethod
+    def _assign_one_to_one(matrix: List[List[float]], threshold: float) -> List[Any]:
+        """Affectation gloutonne : paires (attendu, candidat) par score décroissant, chacun utilisé une fois."""
+        pairs = sorted(
+            ((score, i, j) for i, row in enumerate(matrix) for j, score in enumerate(row) if score >= threshold),
+            key=lambda p: (-p[0], p[1], p[2]),
+        )
+        choices: List[Any] = [None] * len(matrix)
+        used = set()
+        for _, i, j in pairs:
+            if choices[i] is None and j not in used:
+                choices[i] = j
+                used.add(j)
+        return choices
+
+    @keyword("Register Candidate Index")
+    def register_candidate_index(
+        self,
+        name: str,
+        candidates: Iterable[_Text],
+        *,
+        normalize: bool = True,
+    ) -> int:
+        """Enregistre une liste de candidats sous un nom pour des recherches répétées.
+
+        Les formes normalisées, trigrammes et longueurs sont calculés une seule fois.
+        Ré-enregistrer un nom remplace l'index. Retourne le nombre de candidats.
+
+        Exemple Robot::
+
+            @{menus}=    Create List    Publier    Mettre en test    Clôturer    Supprimer
+            Register Candidate Index    menus    ${menus}
+            ${best}=    Get Closest String From Index    supprim    menus
+        """
+        items = list(candidates)
+        if not items:
+            raise ValueError("Liste de candidats vide")
+        norms = [self.normalize_text_for_matching(item) if normalize else item for item in items]
+        self._indexes[name] = (_CandidateIndex(items, norms), normalize)
+        return len(items)
+
+    @keyword("Get Closest String From Index")
+    def get_closest_string_from_index(
+        self,
+        expected: _Text,
+        name: str,
+        *,
+        threshold: float = 0.72,
+        ambiguity_delta: float = 0.05,
+        scorer: Optional[str] = None,
+    ) -> str:
+        """Comme ``Get Closest String`` mais sur un index enregistré avec ``Register Candidate Index``.
+
+        Le résultat (meilleur candidat, seuil, ambiguïté et messages d'erreur) est identique
+        à ``Get Closest String`` sur la même liste ; seuls les candidats qui peuvent encore
+        changer le résultat sont comparés exactement.
+        """
+        if name not in self._indexes:
+            raise ValueError(f"Index de candidats inconnu : '{name}'")
+        index, normalize = self._indexes[name]
+
+        exp = _to_str(expected)
+        exp_norm = self.normalize_text_for_matching(exp) if normalize else exp
+        best_item, best_score, second_score = index.search(exp_norm, threshold, ambiguity_delta,
+                                                           self._get_scorer(scorer))
+
+        return self._check_match(exp, best_item, best_score, second_score, threshold, ambiguity_delta)
+
+    def _get_scorer(self, scorer: Optional[str] = None) -> _Scorer:
+        name = (scorer or getattr(self, "scorer", "difflib")).strip().lower()
+        if name not in SCORERS:
+            raise ValueError(f"Score inconnu '{name}', attendu parmi : {', '.join(SCORERS)}")
+        return SCORERS[name]
+
+    @staticmethod
+    def _check_match(exp: str, best_item: Any, best_score: float, second_score: float,
+                     threshold: float, ambiguity_delta: float) -> Any:
         if best_score < float(threshold):
             raise ValueError(
                 f"Aucun match fiable pour '{exp}' : best='{best_item}' score={best_score:.3f} seuil={threshold}"
@@ -137,5 +630,3 @@ class StringMatching:
             )
 
         return best_item
-
-    
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Ordonnancement des tests pour l'exécution en parallèle, à partir des durées passées.
+
+Les durées (`test_elapsed`) des fichiers d'audit NDJSON de ReporterLibrary servent à
+estimer chaque test (médiane des dernières exécutions réussies). Les tests sont ensuite
+répartis en lots équilibrés (LPT : le plus long d'abord, dans le lot le moins chargé).
+Un test jamais exécuté reçoit une estimation par défaut (médiane des tests connus).
+
+Utilisé comme pre-run modifier Robot Framework, il ne garde que les tests du lot demandé
+et peut placer en premier les tests en échec à leur dernière exécution :
+
+    robot --prerunmodifier lib/TestScheduler.py;shard=2;shards=4;by=feature;include=CU00;failing_first=true ...
+
+Le filtrage par tags (`--include`/`--exclude`) de Robot intervient après les pre-run
+modifiers : les mêmes tags doivent être passés au modifier pour équilibrer les bons tests.
+
+En ligne de commande, produit le plan et un fichier d'arguments Robot par worker :
+
+    python lib/TestScheduler.py features --shards 4 --include CU00 --output run/workspace/shards
+
+Variables d'environnement :
+  - TEST_SCHEDULER_AUDIT_DIR: répertoire des fichiers NDJSON (défaut: WORKSPACE)
+  - TEST_SCHEDULER_DEFAULT_MS: estimation d'un test inconnu quand aucun test n'est connu (défaut: 30000)
+"""
+
+import argparse
+import glob
+import heapq
+import json
+import os
+import statistics
+import sys
+from collections import deque
+
+from robot.api import SuiteVisitor, TestSuiteBuilder
+
+from LibraryUtils import to_bool
+
+# Nombre d'exécutions réussies retenues par test pour l'estimation
+HISTORY_WINDOW = 10
+
+
+def _split(patterns):
+    if not patterns:
+        return []
+    if isinstance(patterns, str):
+        patterns = patterns.split(',')
+    return [p.strip() for p in patterns if p.strip()]
+
+
+def load_history(audit_dir=None) -> dict:
+    """Lit les fichiers NDJSON ligne à ligne et retourne {(suite, test): (durées récentes, dernier statut)}."""
+    audit_dir = audit_dir or os.environ.get('TEST_SCHEDULER_AUDIT_DIR') or os.environ.get('WORKSPACE', '.')
+    history = {}
+    for file_path in sorted(glob.glob(os.path.join(audit_dir, '*.ndjson'))):
+        with open(file_path, encoding='UTF8') as stream:
+            for line in stream:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                key = (record.get('suite_name', ''), record.get('test_name', ''))
+                entry = history.get(key)
+                if entry is None:
+                    entry = history[key] = [deque(maxlen=HISTORY_WINDOW), None, '']
+                timestamp = record.get('timestamp', '')
+                if timestamp >= entry[2]:
+                    entry[1], entry[2] = record.get('test_status'), timestamp
+                # les échecs sont audités à 0 ms : seules les durées des succès sont significatives
+                if record.get('test_status') == 'PASS':
+                    entry[0].append(int(record.get('test_elapsed') or 0))
+    return {key: (list(durations), status) for key, (durations, status, _) in history.items()}
+
+
+def _history_key(test) -> tuple:
+    # même clé que ReporterLibrary.get_audit_data : (dernière suite parente, nom du test)
+    return (test.parent.name if test.parent is not None else '', test.name)
+
+
+def estimate_durations(tests: list, history: dict, default_estimate=None) -> list:
+    """Retourne l'estimation en ms de chaque test (même ordre que `tests`)."""
+    known = {}
+    for test in tests:
+        durations = history.get(_history_key(test), ((), None))[0]
+        if durations:
+            known[id(test)] = statistics.median(durations)
+    if default_estimate is None:
+        default_estimate = (statistics.median(known.values()) if known
+                            else float(os.environ.get('TEST_SCHEDULER_DEFAULT_MS', 30000)))
+    return [known.get(id(test), float(default_estimate)) for test in tests]
+
+
+def feature_units(tests: list, estimates: list) -> tuple:
+    """Regroupe les tests par fichier de feature : (unités [indices des tests], estimations des unités)."""
+    units = {}
+    for index, test in enumerate(tests):
+        units.setdefault(str(test.source), []).append(index)
+    groups = list(units.values())
+    return groups, [sum(estimates[index] for index in group) for group in groups]
+
+
+def plan_shards(estimates: list, shards: int) -> list:
+    """Répartit les indices des tests en `shards` lots équilibrés (LPT) : [(charge, [indices])]."""
+    shards = max(1, int(shards))
+    order = sorted(range(len(estimates)), key=lambda index: (-estimates[index], index))
+    heap = [(0.0, shard) for shard in range(shards)]
+    plan = [[0.0, []] for _ in range(shards)]
+    for index in order:
+        load, shard = heapq.heappop(heap)
+        plan[shard][0] = load + estimates[index]
+        plan[shard][1].append(index)
+        heapq.heappush(heap, (plan[shard][0], shard))
+    return [(load, sorted(indices)) for load, indices in plan]
+
+
+def shard_indices(tests: list, estimates: list, shards: int, by: str = 'scenario') -> list:
+    """Retourne, pour chaque lot, les indices des tests à exécuter (répartition par scénario ou par feature)."""
+    if by == 'feature':
+        groups, group_estimates = feature_units(tests, estimates)
+        return [sorted(index for group in indices for index in groups[group])
+                for _, indices in plan_shards(group_estimates, shards)]
+    return [indices for _, indices in plan_shards(estimates, shards)]
+
+
+class TestScheduler(SuiteVisitor):
+    """Pre-run modifier : garde les tests d'un lot équilibré et/ou place les échecs récents en premier.
+
+    Options:
+      - shard: numéro du lot à exécuter, de 1 à `shards` (défaut: tous les tests)
+      - shards: nombre de lots (défaut: 1)
+      - by: unité de répartition, `scenario` (chaque test) ou `feature` (fichier entier) (défaut: scenario)
+      - include / exclude: tags des tests à planifier, séparés par des virgules (comme --include/--exclude)
+      - failing_first: exécute d'abord les tests en échec à leur dernière exécution (défaut: false)
+      - audit_dir: répertoire des fichiers NDJSON (défaut: TEST_SCHEDULER_AUDIT_DIR, sinon WORKSPACE)
+      - default_estimate: estimation d'un test inconnu en ms (défaut: médiane des tests connus)
+    """
+
+    def __init__(self, shard=None, shards=1, by='scenario', include=None, exclude=None, failing_first=False,
+                 audit_dir=None, default_estimate=None):
+        self.shards = max(1, int(shards))
+        self.by = by.lower()
+        if self.by not in ('scenario', 'feature'):
+            raise ValueError(f"Unité de répartition '{by}' inconnue, attendu scenario ou feature")
+        self.shard = int(shard) if shard not in (None, '') else None
+        if self.shard is not None and not 1 <= self.shard <= self.shards:
+            raise ValueError(f"Lot {self.shard} invalide, attendu entre 1 et {self.shards}")
+        self.include = _split(include)
+        self.exclude = _split(exclude)
+        self.failing_first = to_bool(failing_first)
+        self.audit_dir = audit_dir
+        self.default_estimate = float(default_estimate) if default_estimate not in (None, '') else None
+
+    def start_suite(self, suite):
+        # tout le travail est fait sur la suite racine
+        if suite.parent is not None:
+            return False
+        if self.include or self.exclude:
+            suite.filter(included_tags=self.include or None, excluded_tags=self.exclude or None)
+        history = load_history(self.audit_dir)
+
+        if self.shard is not None and self.shards > 1:
+            tests = list(suite.all_tests)
+            estimates = estimate_durations(tests, history, self.default_estimate)
+            keep = {id(tests[index]) for index in shard_indices(tests, estimates, self.shards, self.by)[self.shard - 1]}
+            self._keep_tests(suite, keep)
+            suite.remove_empty_suites()
+
+        if self.failing_first:
+            failed = {id(test) for test in suite.all_tests if history.get(_history_key(test), ((), None))[1] == 'FAIL'}
+            self._failing_first(suite, failed)
+        return False
+
+    def _keep_tests(self, suite, keep):
+        suite.tests = [test for test in suite.tests if id(test) in keep]
+        for child in suite.suites:
+            self._keep_tests(child, keep)
+
+    def _failing_first(self, suite, failed) -> bool:
+        """Trie tests et sous-suites (tri stable) : ceux contenant un échec récent d'abord."""
+        children_failed = {id(child): self._failing_first(child, failed) for child in suite.suites}
+        suite.suites = sorted(suite.suites, key=lambda child: not children_failed[id(child)])
+        suite.tests = sorted(suite.tests, key=lambda test: id(test) not in failed)
+        return any(children_failed.values()) or any(id(test) in failed for test in suite.tests)
+
+
+def build_suite(paths, language='fr', parser=None):
+    """Construit la suite Robot des features comme `robot --parser lib/CachedGherkinParser.py --language fr`."""
+    parser = parser or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'CachedGherkinParser.py')
+    builder = TestSuiteBuilder(custom_parsers=[parser] if parser else (), lang=language)
+    return builder.build(*paths)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Répartition des tests en lots équilibrés selon les durées passées")
+    parser.add_argument('paths', nargs='+', help="répertoires ou fichiers de features")
+    parser.add_argument('--shards', type=int, required=True, help="nombre de lots (workers)")
+    parser.add_argument('--by', choices=('scenario', 'feature'), default='scenario', help="unité de répartition")
+    parser.add_argument('--include', default=None, help="tags inclus, séparés par des virgules")
+    parser.add_argument('--exclude', default=None, help="tags exclus, séparés par des virgules")
+    parser.add_argument('--failing-first', action='store_true', help="tests en échec récent en premier")
+    parser.add_argument('--audit-dir', default=None, help="répertoire des fichiers NDJSON (défaut: WORKSPACE)")
+    parser.add_argument('--default-estimate', type=float, default=None, help="estimation d'un test inconnu (ms)")
+    parser.add_argument('--language', default='fr')
+    parser.add_argument('--output', default=None, help="répertoire des fichiers d'arguments shard_<n>.args")
+    args = parser.parse_args(argv)
+
+    suite = build_suite(args.paths, args.language)
+    if args.include or args.exclude:
+        suite.filter(included_tags=_split(args.include) or None, excluded_tags=_split(args.exclude) or None)
+    tests = list(suite.all_tests)
+    estimates = estimate_durations(tests, load_history(args.audit_dir), args.default_estimate)
+    plan = shard_indices(tests, estimates, args.shards, args.by)
+
+    for number, indices in enumerate(plan, start=1):
+        load = sum(estimates[index] for index in indices)
+        print(f"Lot {number} : {len(indices)} test(s), {load / 1000:.1f} s estimées")
+        for index in indices:
+            print(f"    {estimates[index] / 1000:8.1f} s  {tests[index].full_name}")
+
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+        options = [f"shards={args.shards}", f"by={args.by}"]
+        options += [f"include={args.include}"] if args.include else []
+        options += [f"exclude={args.exclude}"] if args.exclude else []
+        options += ["failing_first=true"] if args.failing_first else []
+        options += [f"audit_dir={os.path.abspath(args.audit_dir)}"] if args.audit_dir else []
+        options += [f"default_estimate={args.default_estimate}"] if args.default_estimate is not None else []
+        for number in range(1, args.shards + 1):
+            modifier = ';'.join([os.path.abspath(__file__), f"shard={number}", *options])
+            with open(os.path.join(args.output, f"shard_{number}.args"), 'w', encoding='UTF8') as argfile:
+                argfile.write(f"--prerunmodifier {modifier}\n")
+        print(f"Fichiers d'arguments écrits dans {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
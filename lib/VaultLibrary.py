@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Librairie Robot Framework d'accès au coffre-fort KeePass des secrets de test.
+
+La dérivation de clé d'un fichier KDBX est volontairement lente : la base est
+ouverte une seule fois par processus (quelle que soit la suite qui l'ouvre),
+puis les entrées sont indexées par (groupe, utilisateur). Les secrets dérivés
+(mot de passe, bearer) sont mis en cache avec une durée de vie optionnelle et
+effacés en fin d'exécution.
+
+Variables d'environnement :
+  - VAULT_SECRET_TTL: durée de vie des secrets en cache, en secondes (défaut: 0 = toute l'exécution)
+"""
+
+import atexit
+import base64
+import os
+import threading
+import time
+
+from pykeepass import PyKeePass
+
+# Coffres ouverts, partagés par toutes les instances du processus : (base, fichier clé) -> _Vault
+_VAULTS = {}
+_VAULTS_LOCK = threading.Lock()
+
+
+class _Vault:
+    """Base KeePass ouverte, index des entrées et cache des secrets dérivés."""
+
+    def __init__(self, database, keyfile, password=None):
+        self.database = database
+        self._keepass = PyKeePass(database, password=password, keyfile=keyfile)
+        self._entries = {}  # groupe -> {utilisateur: entrée}
+        self._secrets = {}  # (groupe, utilisateur) -> (expiration, secret)
+        self._lock = threading.Lock()
+
+    def _group_entries(self, group):
+        entries = self._entries.get(group)
+        if entries is None:
+            keepass_group = self._keepass.find_groups(name=group, first=True)
+            if keepass_group is None:
+                raise AssertionError(f"Le groupe {group} n'existe pas dans le coffre-fort {self.database}")
+            entries = {}
+            for entry in self._keepass.find_entries(group=keepass_group):
+                if entry.username:
+                    entries.setdefault(entry.username, entry)
+            self._entries[group] = entries
+        return entries
+
+    def secret(self, group, username, ttl):
+        now = time.monotonic()
+        with self._lock:
+            cached = self._secrets.get((group, username))
+            if cached is not None and (cached[0] is None or cached[0] > now):
+                return cached[1]
+
+            entry = self._group_entries(group).get(username)
+            if entry is None:
+                raise AssertionError(f"L'utilisateur {username} n'existe pas dans le groupe {group} "
+                                     f"du coffre-fort {self.database}")
+            password = entry.password or ''
+            secret = {
+                'username': username,
+                'password': password,
+                'bearer': base64.b64encode(f"{username}:{password}".encode('utf-8')),
+            }
+            self._secrets[(group, username)] = (now + ttl if ttl > 0 else None, secret)
+            return secret
+
+    def wipe(self):
+        with self._lock:
+            for _, secret in self._secrets.values():
+                secret.clear()
+            self._secrets.clear()
+            self._entries.clear()
+            self._keepass = None
+
+
+def _wipe_vaults():
+    with _VAULTS_LOCK:
+        for vault in _VAULTS.values():
+            vault.wipe()
+        _VAULTS.clear()
+
+
+atexit.register(_wipe_vaults)
+
+
+class VaultLibrary:
+    """Accès aux secrets du coffre-fort KeePass, base ouverte une seule fois par processus.
+
+    Options:
+      - secret_ttl: durée de vie des secrets en cache en secondes (défaut: VAULT_SECRET_TTL, sinon 0 = sans expiration)
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, secret_ttl=None):
+        self.ROBOT_LIBRARY_LISTENER = self
+        self.secret_ttl = float(secret_ttl if secret_ttl is not None else os.environ.get('VAULT_SECRET_TTL', 0))
+        self._vault = None
+
+    def open_vault_database(self, database, keyfile=None, password=None):
+        """Ouvre la base KeePass, sauf si elle est déjà ouverte dans ce processus.
+
+        Examples:
+        | Open Vault Database | ${EXECDIR}/dataset/secrets.kdbx | keyfile=${WORKSPACE}/secrets.keyx |
+        """
+        key = (os.path.abspath(database), os.path.abspath(keyfile) if keyfile else None)
+        with _VAULTS_LOCK:
+            vault = _VAULTS.get(key)
+            if vault is None:
+                vault = _Vault(key[0], key[1], password)
+                _VAULTS[key] = vault
+        self._vault = vault
+
+    def get_vault_secret(self, username, group):
+        """Retourne le secret d'un utilisateur du groupe : dictionnaire username, password, bearer.
+
+        Le bearer est l'encodage base64 de `username:password`.
+
+        Examples:
+        | ${secret}= | Get Vault Secret | user1@develop.sample.fr | INTEG |
+        """
+        if self._vault is None:
+            raise AssertionError("Coffre-fort non ouvert : appeler 'Open Vault Database' avant")
+        return dict(self._vault.secret(group, username, self.secret_ttl))
+
+    def close_vault_database(self):
+        """Efface les secrets en cache et ferme toutes les bases ouvertes du processus."""
+        _wipe_vaults()
+        self._vault = None
+
+    def _close(self):
+        self.close_vault_database()
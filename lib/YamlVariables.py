@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Fichier de variables Robot Framework pour les YAML, avec cache du contenu analysé.
+
+Remplace l'import YAML natif (`Variables  fichier.yaml` / `--variablefile fichier.yaml`)
+qui ré-analyse le fichier avec le loader PyYAML pur Python à chaque suite :
+  - analyse avec le loader C `CSafeLoader` quand il est disponible
+  - cache en mémoire par chemin, invalidé si la date de modification ou la taille change
+  - cache disque optionnel (pickle) dans `WORKSPACE/.yaml_cache`, partagé entre processus
+    (variable d'environnement YAML_DISK_CACHE=true)
+
+Usage Robot:
+    Variables    ${CURDIR}/../lib/YamlVariables.py    ${CURDIR}/../dataset/INTEG_dataset.yaml
+    robot --variablefile lib/YamlVariables.py;run/workspace/settings.yaml ...
+
+Les valeurs retournées sont converties comme l'import YAML natif (dict -> DotDict)
+dans de nouveaux conteneurs à chaque import : une suite qui modifie un dictionnaire
+n'affecte pas les autres.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import threading
+
+import yaml
+from robot.utils import DotDict
+
+from LibraryUtils import atomic_path, to_bool
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # libyaml absente : loader pur Python
+    from yaml import SafeLoader as _Loader
+
+# Version du format du cache disque (à incrémenter si le contenu stocké change)
+_DISK_CACHE_VERSION = 1
+
+# Contenu analysé par chemin absolu : chemin -> ((mtime_ns, taille), données)
+_CACHE = {}
+_LOCK = threading.Lock()
+
+
+def _disk_cache_enabled() -> bool:
+    return to_bool(os.environ.get('YAML_DISK_CACHE'))
+
+
+def _disk_cache_path(path: str) -> str:
+    digest = hashlib.sha1(path.encode('utf-8')).hexdigest()
+    return os.path.join(os.environ.get('WORKSPACE', '.'), '.yaml_cache', f"{digest}.pickle")
+
+
+def _read_disk_cache(path: str, signature: tuple):
+    try:
+        with open(_disk_cache_path(path), 'rb') as stream:
+            entry = pickle.load(stream)
+    except (OSError, pickle.PickleError, EOFError, AttributeError, ValueError):
+        return None
+    if entry.get('version') != _DISK_CACHE_VERSION or entry.get('signature') != signature:
+        return None
+    return entry['data']
+
+
+def _write_disk_cache(path: str, signature: tuple, data) -> None:
+    cache_path = _disk_cache_path(path)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # plusieurs workers peuvent remplir le cache en même temps
+        with atomic_path(cache_path) as temp_path:
+            with open(temp_path, 'wb') as stream:
+                pickle.dump({'version': _DISK_CACHE_VERSION, 'signature': signature, 'data': data},
+                            stream, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass  # le cache disque est une optimisation, jamais bloquant
+
+
+def load_yaml(path: str):
+    """Retourne le contenu analysé du fichier YAML (partagé : ne pas le modifier).
+
+    Args:
+        path: chemin du fichier YAML
+
+    Returns:
+        données Python (dict, list, ...) telles que produites par yaml.safe_load
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _LOCK:
+        entry = _CACHE.get(path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        data = _read_disk_cache(path, signature) if _disk_cache_enabled() else None
+        if data is None:
+            with open(path, encoding='utf-8') as stream:
+                data = yaml.load(stream, Loader=_Loader)
+            if data is None:
+                data = {}
+            if _disk_cache_enabled():
+                _write_disk_cache(path, signature, data)
+
+        _CACHE[path] = (signature, data)
+        return data
+
+
+def to_dot_dict(value):
+    """Convertit récursivement comme l'import YAML de Robot (dict -> DotDict), dans de nouveaux conteneurs."""
+    if isinstance(value, dict):
+        return DotDict((k, to_dot_dict(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return [to_dot_dict(v) for v in value]
+    return value
+
+
+def get_variables(path: str) -> dict:
+    """Point d'entrée Robot Framework des fichiers de variables."""
+    data = load_yaml(path)
+    if not isinstance(data, dict):
+        raise ValueError(f"Le fichier de variables YAML doit contenir un dictionnaire : {path}")
+    return {name: to_dot_dict(value) for name, value in data.items()}
+
+
+if __name__ == '__main__':
+    # Pré-remplit le cache disque (ex: avant de lancer des workers en parallèle)
+    os.environ['YAML_DISK_CACHE'] = 'true'
+    for yaml_path in sys.argv[1:]:
+        load_yaml(yaml_path)
+        print(f"Cache YAML prêt : {yaml_path}")
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""Benchmark du coût propre du framework (steps, services, pages, socle dry-run, listener, logs).
+
+Génère des features Gherkin synthétiques à la taille demandée (features, scénarios,
+steps par scénario, lignes d'`Exemples`, taille de la datatable) et leurs steps en
+couches step -> service -> page -> web_socle (socle dry-run : aucun navigateur).
+Les exécute avec ReporterLibrary (listener, audits NDJSON, profileur) et StepsLogger,
+dans un processus Robot Framework séparé, puis mesure :
+  - steps Gherkin exécutés par seconde (durée d'exécution de la suite, hors démarrage)
+  - coût propre par appel de chaque couche et des mots-clés les plus coûteux (profileur)
+  - pic mémoire du processus Robot
+  - octets écrits : StepsLogger.log, audits NDJSON, output.xml, console
+
+Le résultat est enregistré en JSON pour comparer deux versions (`--compare`).
+
+Usage:
+    python run/benchmark/bench_framework.py [--features 20] [--scenarios 5] [--steps 8]
+        [--examples 0] [--datatable 0] [--trace-level TRACE] [--output bench_framework.json]
+        [--compare previous.json] [--keep]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+LIB_DIR = os.path.join(PROJECT_DIR, 'lib')
+SOCLE_DIR = os.path.join(PROJECT_DIR, 'resources', 'socle')
+
+STEPS_RESOURCE = """*** Settings ***
+Documentation       Steps synthétiques du benchmark du framework
+
+Library     {lib}/GherkinDatatableConverter.py  AS  Datatable
+Library     {lib}/StepsLogger.py
+Resource    {socle}/settings_socle.resource
+Resource    ../../resources/bench_service.resource
+
+
+*** Keywords ***
+Un utilisateur avec le profil "${{profil}}"
+  StepsLogger.Step  Utilisateur avec le profil "${{profil}}"...
+  bench_service.Ouvrir L'Application  ${{profil}}
+  StepsLogger.Success  Utilisateur "${{profil}}" prêt
+
+l'utilisateur réalise l'action "${{action}}"
+  StepsLogger.Step  Action "${{action}}"...
+  ${{resultat}}=  bench_service.Realiser L'Action  ${{action}}
+  StepsLogger.Success  Action "${{action}}" réalisée : ${{resultat}}
+
+l'utilisateur saisit le formulaire
+  [Arguments]  ${{rows}}
+  StepsLogger.Step  Saisie du formulaire...
+  ${{lignes}}=  Datatable.Convert Datatable To List Of Dicts  ${{rows}}
+  bench_service.Saisir Le Formulaire  ${{lignes}}
+  StepsLogger.Success  ${{{{ len($lignes) }}}} ligne(s) saisie(s)
+"""
+
+SERVICE_RESOURCE = """*** Settings ***
+Library     {lib}/StepsLogger.py
+Resource    bench_page.resource
+
+
+*** Keywords ***
+Ouvrir L'Application
+  [Arguments]  ${{profil}}
+  StepsLogger.Service  Ouverture de l'application pour "${{profil}}"...
+  bench_page.Aller Vers La Page D'Accueil
+
+Realiser L'Action
+  [Arguments]  ${{action}}
+  StepsLogger.Service  Réalisation de l'action "${{action}}"...
+  bench_page.Cliquer Sur Le Bouton  ${{action}}
+  ${{resultat}}=  bench_page.Lire Le Resultat  ${{action}}
+  RETURN  ${{resultat}}
+
+Saisir Le Formulaire
+  [Arguments]  ${{lignes}}
+  StepsLogger.Service  Saisie de ${{{{ len($lignes) }}}} ligne(s)...
+  FOR  ${{ligne}}  IN  @{{lignes}}
+    bench_page.Renseigner Le Champ  ${{ligne}}[champ]  ${{ligne}}[valeur]
+  END
+"""
+
+PAGE_RESOURCE = """*** Settings ***
+Library     {lib}/StepsLogger.py
+Resource    web_socle.resource
+
+
+*** Keywords ***
+Aller Vers La Page D'Accueil
+  StepsLogger.Page  Je vais vers la page d'accueil...
+  web_socle.Ouvrir Navigateur Sur  https://bench.invalid/
+  web_socle.L'Element Doit Etre Visible  //h1
+
+Cliquer Sur Le Bouton
+  [Arguments]  ${{action}}
+  StepsLogger.Page  Je clique sur le bouton "${{action}}"...
+  web_socle.Cliquer Sur Element  //button[@id='${{action}}']
+
+Lire Le Resultat
+  [Arguments]  ${{action}}
+  StepsLogger.Page  Je lis le résultat de "${{action}}"...
+  ${{texte}}=  web_socle.Obtenir Le Texte De L'Element  //div[@id='resultat-${{action}}']
+  RETURN  ${{texte}}
+
+Renseigner Le Champ
+  [Arguments]  ${{champ}}  ${{valeur}}
+  StepsLogger.Page  Je renseigne le champ "${{champ}}"...
+  web_socle.Saisir Dans Champ  ${{valeur}}  //input[@name='${{champ}}']
+"""
+
+
+def generate_feature(index: int, scenarios: int, steps: int, examples: int, datatable: int) -> str:
+    """Retourne le texte d'une feature : `scenarios` scénarios de `steps` steps (hors datatable)."""
+    lines = ["#language: fr", f"Fonctionnalité: Benchmark {index}", ""]
+    for scenario in range(1, scenarios + 1):
+        lines.append(f"    @BENCH @F{index}")
+        lines.append(f"    {'Plan du Scénario' if examples else 'Scénario'}: Scénario {index}-{scenario}")
+        profil = "<profil>" if examples else "usager"
+        lines.append(f"        Étant donné Un utilisateur avec le profil \"{profil}\"")
+        for step in range(1, steps):
+            lines.append(f"        Et l'utilisateur réalise l'action \"action-{step}\"")
+        if datatable:
+            lines.append("        Et l'utilisateur saisit le formulaire")
+            lines.append("            | champ | valeur |")
+            lines.extend(f"            | champ-{row} | valeur-{row} |" for row in range(1, datatable + 1))
+        if examples:
+            lines.append("")
+            lines.append("        Exemples:")
+            lines.append("            | profil |")
+            lines.extend(f"            | profil-{row} |" for row in range(1, examples + 1))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def generate_project(root: str, args) -> int:
+    """Écrit les features et les resources du benchmark. Retourne le nombre de steps Gherkin par test."""
+    features_dir = os.path.join(root, 'features')
+    os.makedirs(os.path.join(features_dir, 'steps'))
+    os.makedirs(os.path.join(root, 'resources'))
+    paths = {'lib': LIB_DIR.replace('\\', '/'), 'socle': SOCLE_DIR.replace('\\', '/')}
+    with open(os.path.join(features_dir, 'steps', 'bench_step.resource'), 'w', encoding='utf-8') as stream:
+        stream.write(STEPS_RESOURCE.format(**paths))
+    with open(os.path.join(root, 'resources', 'bench_service.resource'), 'w', encoding='utf-8') as stream:
+        stream.write(SERVICE_RESOURCE.format(**paths))
+    with open(os.path.join(root, 'resources', 'bench_page.resource'), 'w', encoding='utf-8') as stream:
+        stream.write(PAGE_RESOURCE.format(**paths))
+    for index in range(1, args.features + 1):
+        with open(os.path.join(features_dir, f"bench_{index:04d}.feature"), 'w', encoding='utf-8') as stream:
+            stream.write(generate_feature(index, args.scenarios, args.steps, args.examples, args.datatable))
+    return args.steps + (1 if args.datatable else 0)
+
+
+def _peak_memory_windows(process) -> int:
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+            (name, ctypes.c_size_t) for name in (
+                'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    ctypes.windll.psapi.GetProcessMemoryInfo(int(process._handle), ctypes.byref(counters), counters.cb)
+    return counters.PeakWorkingSetSize
+
+
+def run_robot(root: str, workspace: str, args) -> tuple:
+    """Exécute les features générées. Retourne (code retour, durée totale en s, pic mémoire en octets)."""
+    env = dict(os.environ)
+    env.update({
+        'WORKSPACE': workspace,
+        'REPORTER_PROFILE': 'true',
+        'REPORTER_PROFILE_FILE': 'keyword_profile',
+        'REPORTER_TRACE_LEVEL': args.trace_level,
+        'FEATURE_CACHE_DIR': os.path.join(root, '.feature_cache'),
+    })
+    command = [
+        sys.executable, '-m', 'robot',
+        '--parser', os.path.join(LIB_DIR, 'CachedGherkinParser.py'),
+        '--outputdir', workspace, '--log', 'NONE', '--report', 'NONE',
+        '--language', 'fr',
+        '--loglevel', 'TRACE',
+        '--variablefile', os.path.join(PROJECT_DIR, 'run', 'workspace', 'settings.yaml'),
+        '--pythonpath', os.pathsep.join([SOCLE_DIR, os.path.join(SOCLE_DIR, 'dry-run'), os.path.join(root, 'resources')]),
+        '--console', 'none',
+        os.path.join(root, 'features'),
+    ]
+    # la console (lignes StepsLogger comprises) va dans un fichier : mesure indépendante du terminal
+    with open(os.path.join(workspace, 'console.log'), 'w', encoding='utf-8') as console:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=PROJECT_DIR, env=env, stdout=console, stderr=subprocess.STDOUT)
+        if hasattr(os, 'wait4'):
+            # rusage du seul processus Robot (ru_maxrss en Ko sous Linux, en octets sous macOS)
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            peak = usage.ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+        else:
+            process.wait()
+            peak = _peak_memory_windows(process)
+    return process.returncode, time.perf_counter() - start, peak
+
+
+def bytes_written(workspace: str) -> dict:
+    """Taille des sorties du framework dans WORKSPACE."""
+    def size(*names):
+        return sum(os.path.getsize(os.path.join(workspace, name)) for name in names
+                   if os.path.isfile(os.path.join(workspace, name)))
+    ndjson = [name for name in os.listdir(workspace) if name.endswith('.ndjson')]
+    result = {'steps_logger_log': size('StepsLogger.log'), 'ndjson': size(*ndjson), 'output_xml': size('output.xml'),
+              'console': size('console.log')}
+    result['total'] = sum(result.values())
+    return result
+
+
+def collect(root: str, workspace: str, steps_per_test: int, args, returncode: int, wall_s: float, peak: int) -> dict:
+    from robot.api import ExecutionResult
+    from robot.version import get_version
+
+    result = ExecutionResult(os.path.join(workspace, 'output.xml'))
+    tests = result.statistics.total.total
+    execution_s = result.suite.elapsed_time.total_seconds()
+    steps = tests * steps_per_test
+
+    with open(os.path.join(workspace, 'keyword_profile.json'), encoding='utf-8') as stream:
+        profile = json.load(stream)
+
+    def overhead(row, name):
+        return {name: row[name], 'count': row['count'], 'self_ms': row['self_ms'],
+                'self_us_per_call': round(row['self_ms'] * 1000 / row['count'], 1)}
+
+    cache_report = {}
+    report_path = os.path.join(workspace, 'feature_cache_report.json')
+    if os.path.isfile(report_path):
+        with open(report_path, encoding='utf-8') as stream:
+            cache_report = json.load(stream)
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR, capture_output=True,
+                                text=True, check=False).stdout.strip()
+    except OSError:
+        commit = ''
+
+    written = bytes_written(workspace)
+    return {
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'commit': commit,
+        'python': platform.python_version(),
+        'robot': get_version(),
+        'platform': platform.platform(),
+        'parameters': {'features': args.features, 'scenarios': args.scenarios, 'steps': args.steps,
+                       'examples': args.examples, 'datatable': args.datatable, 'trace_level': args.trace_level},
+        'returncode': returncode,
+        'tests': tests,
+        'passed': result.statistics.total.passed,
+        'steps': steps,
+        'wall_s': round(wall_s, 3),
+        'parse_ms': cache_report.get('parse_ms'),
+        'execution_s': round(execution_s, 3),
+        'steps_per_s': round(steps / execution_s, 1) if execution_s else None,
+        'ms_per_step': round(execution_s * 1000 / steps, 3) if steps else None,
+        'peak_memory_bytes': peak,
+        'bytes_written': written,
+        'bytes_per_step': round(written['total'] / steps, 1) if steps else None,
+        'layers': [overhead(row, 'layer') for row in profile['layers']],
+        'keywords': [overhead(row, 'keyword') for row in profile['keywords'][:args.top]],
+    }
+
+
+def print_summary(results: dict, previous: dict = None) -> None:
+    def delta(key, higher_is_better=True):
+        if not previous or not previous.get(key) or results.get(key) is None:
+            return ""
+        change = (results[key] - previous[key]) / previous[key] * 100
+        worse = change < 0 if higher_is_better else change > 0
+        return f"  ({change:+.1f} %{' régression' if worse and abs(change) >= 5 else ''})"
+
+    print(f"{results['tests']} test(s), {results['steps']} step(s), {results['passed']} réussi(s)"
+          f" - démarrage + exécution : {results['wall_s']:.2f} s")
+    print(f"Débit          : {results['steps_per_s']:,.1f} steps/s{delta('steps_per_s')}")
+    print(f"Coût par step  : {results['ms_per_step']:.3f} ms{delta('ms_per_step', False)}")
+    print(f"Pic mémoire    : {results['peak_memory_bytes'] / 1048576:.1f} Mo"
+          f"{delta('peak_memory_bytes', False)}")
+    print(f"Octets écrits  : {results['bytes_written']['total']:,} ({results['bytes_per_step']:,.0f} par step)"
+          f"{delta('bytes_per_step', False)}")
+    for name in ('steps_logger_log', 'ndjson', 'output_xml', 'console'):
+        print(f"    {name:<18} {results['bytes_written'][name]:>14,}")
+    print()
+    print(f"{'couche':<10} {'appels':>9} {'self (ms)':>10} {'µs/appel':>10}")
+    for row in results['layers']:
+        print(f"{row['layer']:<10} {row['count']:>9} {row['self_ms']:>10} {row['self_us_per_call']:>10}")
+    print()
+    width = max([len('mot-clé')] + [len(row['keyword']) for row in results['keywords']])
+    print(f"{'mot-clé':<{width}} {'appels':>9} {'self (ms)':>10} {'µs/appel':>10}")
+    for row in results['keywords']:
+        print(f"{row['keyword']:<{width}} {row['count']:>9} {row['self_ms']:>10} {row['self_us_per_call']:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--features', type=int, default=20, help="nombre de features générées")
+    parser.add_argument('--scenarios', type=int, default=5, help="scénarios par feature")
+    parser.add_argument('--steps', type=int, default=8, help="steps par scénario (hors datatable)")
+    parser.add_argument('--examples', type=int, default=0, help="lignes d'Exemples par scénario (0 = Scénario simple)")
+    parser.add_argument('--datatable', type=int, default=0, help="lignes de la datatable d'un step par scénario (0 = aucune)")
+    parser.add_argument('--trace-level', default='TRACE', type=str.upper,
+                        choices=('TRACE', 'DEBUG', 'INFO', 'WARN', 'ERROR'), help="REPORTER_TRACE_LEVEL du listener (défaut: TRACE)")
+    parser.add_argument('--top', type=int, default=15, help="mots-clés les plus coûteux retenus")
+    parser.add_argument('--output', default='bench_framework.json', help="fichier JSON des résultats")
+    parser.add_argument('--compare', default=None, help="résultats JSON d'une version précédente")
+    parser.add_argument('--keep', action='store_true', help="conserve le répertoire de travail généré")
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix='bench_framework_')
+    workspace = os.path.join(root, 'workspace')
+    os.makedirs(workspace)
+    try:
+        steps_per_test = generate_project(root, args)
+        returncode, wall_s, peak = run_robot(root, workspace, args)
+        if not os.path.isfile(os.path.join(workspace, 'output.xml')):
+            print(f"Robot Framework n'a produit aucun résultat (code {returncode}).")
+            return 252
+        if not os.path.isfile(os.path.join(workspace, 'keyword_profile.json')):
+            # ReporterLibrary absent ou en erreur : le profil des mots-clés n'a pas été écrit
+            print(f"Aucun profil des mots-clés produit (code {returncode}), voir {workspace}/console.log")
+            return 252
+        results = collect(root, workspace, steps_per_test, args, returncode, wall_s, peak)
+    finally:
+        if args.keep:
+            print(f"Répertoire de travail conservé : {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as stream:
+            previous = json.load(stream)
+    print_summary(results, previous)
+    with open(args.output, 'w', encoding='utf-8') as stream:
+        json.dump(results, stream, ensure_ascii=False, indent=2)
+    print(f"\nRésultats enregistrés dans {args.output}")
+    return 0 if results['passed'] == results['tests'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmark du formatage des lignes StepsLogger (lignes/seconde par catégorie).
+
+Compare l'ancien `_emit` (strftime + slicing, ré-encodage UTF-8 systématique,
+lookups EMOJI/INDENT/LEVELS et ligne console construite à chaque appel)
+avec l'implémentation actuelle à gabarits précalculés.
+
+Les écritures Robot (`robot.api.logger`) et le fichier de log sont neutralisés
+pour ne mesurer que le coût de formatage sur le thread de test.
+
+Usage:
+    python run/benchmark/bench_steps_logger.py [--lines 100000] [--colored-console]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'lib'))
+os.environ.setdefault('WORKSPACE', tempfile.mkdtemp(prefix='bench_steps_logger_'))
+
+import StepsLogger as steps_logger_module  # noqa: E402
+from StepsLogger import ANSI, EMOJI, INDENT, LEVELS, StepsLogger  # noqa: E402
+
+MESSAGE = "Démarrage du mot-clé 'web_socle.Obtenir Le Texte De L'Element'."
+
+# (méthode, arguments) par catégorie
+CATEGORIES = {
+    "test":    ("test", ()),
+    "step":    ("step", ()),
+    "service": ("service", ()),
+    "page":    ("page", ()),
+    "socle":   ("socle", ()),
+    "success": ("success", ("SOCLE",)),
+    "error":   ("error", ("STEP",)),
+}
+
+
+class _NullSink:
+    def write(self, line):
+        pass
+
+
+def _mute_robot_logger():
+    noop = lambda *args, **kwargs: None  # noqa: E731
+    for name in ("info", "debug", "warn", "error", "console"):
+        setattr(steps_logger_module.logger, name, noop)
+
+
+class LegacyFormatter:
+    """Copie du formatage historique de StepsLogger._emit (référence « avant »)."""
+
+    def __init__(self, tz="UTC", ms3=True, color=True, emoji=True, colored_console=False):
+        self.tz = tz.upper()
+        self.ms3 = ms3
+        self.color = color
+        self.emoji = emoji
+        self.colored_console = colored_console
+        self.emoji_in_console = emoji
+
+    def _timestamp_iso_z(self):
+        now = datetime.now(timezone.utc)
+        if self.ms3:
+            base = now.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+            return f"{base}Z"
+        return now.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def emit(self, category, msg, label_override):
+        level, color_code = LEVELS[category]
+        ts = self._timestamp_iso_z()
+        emoji_sym = EMOJI.get(category, "")
+        label = label_override if label_override else category.upper()
+        indent = INDENT.get(label.lower(), "")
+        msg_with_emoji = str(msg).encode('utf-8', errors='replace').decode('utf-8')
+        file_line = f"{ts} [{level}] {indent}" \
+                    f"{(emoji_sym + ' ') if (self.emoji and emoji_sym) else ''}" \
+                    f"{label}: {msg_with_emoji}"
+        if self.emoji_in_console:
+            console_line = file_line
+        else:
+            console_line = f"{ts} [{level}] {label}: {msg_with_emoji}"
+        if self.color and color_code:
+            console_line = f"{color_code}{console_line}{ANSI['reset']}"
+        return file_line, console_line
+
+
+def _rate(func, lines):
+    started = time.perf_counter()
+    for _ in range(lines):
+        func()
+    return lines / (time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=100000, help="lignes émises par catégorie")
+    parser.add_argument('--colored-console', action='store_true', help="active la ligne console colorée")
+    args = parser.parse_args(argv)
+
+    _mute_robot_logger()
+    legacy = LegacyFormatter(colored_console=args.colored_console)
+    current = StepsLogger(colored_console=args.colored_console)
+    current._sink = _NullSink()
+
+    print(f"{'catégorie':<10} {'avant (l/s)':>14} {'après (l/s)':>14} {'gain':>7}")
+    for category, (method, extra) in CATEGORIES.items():
+        label = extra[0] if extra else None
+        before = _rate(lambda: legacy.emit(category, MESSAGE, label), args.lines)
+        bound = getattr(current, method)
+        after = _rate(lambda: bound(MESSAGE, *extra), args.lines)
+        print(f"{category:<10} {before:>14,.0f} {after:>14,.0f} {after / before:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""Benchmark des scores de similarité de StringMatching sur un corpus de libellés français.
+
+Pour chaque score (difflib, levenshtein, damerau, token_set) :
+  - débit en recherches/seconde (Get Closest String sur tout le corpus)
+  - exactitude : le libellé d'origine est retrouvé
+  - accord avec difflib : même meilleur candidat que le score par défaut
+
+Les requêtes sont dérivées du corpus : accents retirés, fautes de frappe,
+inversion de lettres, mots réordonnés, libellé tronqué.
+
+Usage:
+    python run/benchmark/bench_string_matching.py [--queries 2000] [--seed 42]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'lib'))
+
+from StringMatching import SCORERS, StringMatching, _strip_accents  # noqa: E402
+
+CORPUS = [
+    "Déposer un dossier", "Dossier déposé", "Dossier en construction", "Dossier en instruction",
+    "Dossier accepté", "Dossier refusé", "Dossier classé sans suite", "Dossier archivé",
+    "Démarche publiée", "Démarche en test", "Démarche close", "Démarche dépubliée",
+    "Publier la démarche", "Clôturer la démarche", "Supprimer la démarche", "Dupliquer la démarche",
+    "Télécharger le dossier", "Télécharger l'attestation", "Générer l'attestation de dépôt",
+    "Demander un avis", "Avis d'expert", "Inviter un expert", "Ajouter un instructeur",
+    "Retirer un instructeur", "Groupe instructeur", "Liste des instructeurs", "Messagerie",
+    "Envoyer un message", "Pièce justificative", "Pièces jointes", "Ajouter une pièce jointe",
+    "Numéro de dossier", "Date de dépôt", "Date de dernière modification", "Date de passage en instruction",
+    "État du dossier", "Statut de la démarche", "Nom de l'usager", "Prénom de l'usager",
+    "Adresse électronique", "Numéro de téléphone", "Code postal", "Commune de résidence",
+    "Numéro SIRET", "Raison sociale", "Forme juridique", "Année de création",
+    "Montant demandé", "Montant accordé", "Motif du refus", "Commentaire de l'instructeur",
+    "Suivre le dossier", "Ne plus suivre le dossier", "Annoter le dossier", "Annotations privées",
+    "Passer en instruction", "Repasser en construction", "Accepter le dossier", "Refuser le dossier",
+    "Classer sans suite", "Réaffecter le dossier", "Exporter les dossiers", "Télécharger l'export",
+    "Filtrer les dossiers", "Rechercher un dossier", "Tableau de bord", "Mes dossiers",
+    "Dossiers à suivre", "Dossiers traités", "Tous les dossiers", "Dossiers expirant",
+    "Paramètres du compte", "Se déconnecter", "Changer de mot de passe", "Préférences de notification",
+    "Mentions légales", "Accessibilité : non conforme", "Déclaration d'accessibilité", "Aide en ligne",
+]
+
+
+def _typo(text, rng):
+    chars = list(text)
+    position = rng.randrange(len(chars))
+    action = rng.choice(("delete", "insert", "replace"))
+    if action == "delete" and len(chars) > 1:
+        del chars[position]
+    elif action == "insert":
+        chars.insert(position, rng.choice("aeiourstnlé"))
+    else:
+        chars[position] = rng.choice("aeiourstnlé")
+    return "".join(chars)
+
+
+def _swap(text, rng):
+    chars = list(text)
+    if len(chars) > 2:
+        position = rng.randrange(len(chars) - 1)
+        chars[position], chars[position + 1] = chars[position + 1], chars[position]
+    return "".join(chars)
+
+
+def _reorder(text, rng):
+    words = text.split()
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+def _truncate(text, rng):
+    return text[:max(3, int(len(text) * rng.uniform(0.6, 0.9)))]
+
+
+PERTURBATIONS = {
+    "accents": lambda text, rng: _strip_accents(text),
+    "typo": _typo,
+    "swap": _swap,
+    "reorder": _reorder,
+    "truncate": _truncate,
+}
+
+
+def build_queries(count, rng):
+    queries = []
+    for _ in range(count):
+        original = rng.choice(CORPUS)
+        kind = rng.choice(list(PERTURBATIONS))
+        queries.append((kind, original, PERTURBATIONS[kind](original, rng)))
+    return queries
+
+
+def _closest(library, query, scorer):
+    # seuil et delta à 0 : on mesure le meilleur candidat, pas la politique de rejet
+    try:
+        return library.get_closest_string(query, CORPUS, threshold=0.0, ambiguity_delta=0.0, scorer=scorer)
+    except ValueError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    queries = build_queries(args.queries, rng)
+    library = StringMatching()
+
+    results = {}
+    for scorer in SCORERS:
+        # cache de normalisation chaud pour ne mesurer que le score
+        for _, _, query in queries[:10]:
+            _closest(library, query, scorer)
+        started = time.perf_counter()
+        answers = [_closest(library, query, scorer) for _, _, query in queries]
+        elapsed = time.perf_counter() - started
+        results[scorer] = (answers, len(queries) / elapsed)
+
+    reference = results["difflib"][0]
+    print(f"{len(CORPUS)} libellés, {len(queries)} requêtes")
+    print(f"{'score':<12} {'req/s':>9} {'exact':>7} {'accord':>7}  " + " ".join(f"{k:>8}" for k in PERTURBATIONS))
+    for scorer, (answers, rate) in results.items():
+        exact = sum(a == original for a, (_, original, _) in zip(answers, queries)) / len(queries)
+        agreement = sum(a == r for a, r in zip(answers, reference)) / len(queries)
+        by_kind = []
+        for kind in PERTURBATIONS:
+            subset = [(a, original) for a, (k, original, _) in zip(answers, queries) if k == kind]
+            by_kind.append(sum(a == o for a, o in subset) / len(subset) if subset else 0.0)
+        print(f"{scorer:<12} {rate:>9,.0f} {exact:>7.1%} {agreement:>7.1%}  " + " ".join(f"{v:>8.1%}" for v in by_kind))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,12 @@
+@echo off
+REM  Historique des exécutions à partir des audits NDJSON du workspace
+REM    voir lib/RunHistory.py
+REM
+REM    usage: history.bat ingest
+REM           history.bat trends [--test NOM] [--window 10]
+REM           history.bat slowdowns [--threshold 0.2]
+REM           history.bat flaky [--window 50] [--json]
+
+if "%WORKSPACE%"=="" set WORKSPACE=%cd%/run/workspace
+
+python %cd%\lib\RunHistory.py %*
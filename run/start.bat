@@ -1,12 +1,13 @@
 @echo off
 REM Vérifier si un argument a été passé
 if "%1"=="" (
-    echo Usage: start.bat ^<TAG^> [--web ^<selenium^|playwright^|dry-run^>] [--headless] [--history]
+    echo Usage: start.bat ^<TAG^> [--web ^<selenium^|playwright^|dry-run^>] [--pool [max_reuse]] [--headless] [--history]
     echo.
     echo Examples:
     echo   start.bat TNR
     echo   start.bat smoke --web selenium
     echo   start.bat regression --web playwright --headless --history
+    echo   start.bat regression --web playwright --pool 50 --headless
     echo.
     exit /b 1
 )
@@ -23,6 +24,8 @@ REM Valeurs par défaut des options
 set WEB_DRIVER=dry-run
 set HEADLESS_MODE=false
 set HISTORY_MODE=false
+REM Pool de navigateurs (voir resources/socle/*/web_socle.resource et lib/BrowserPool.py)
+REM   si --pool n'est pas fourni, la valeur browser_pool des settings s'applique
 
 REM Parcours tous les arguments
 set "TAG=%~1"
@@ -34,6 +37,13 @@ if "%~1"=="" goto args_done
 if /i "%~1"=="--web" (
     set "WEB_DRIVER=%~2"
     shift
+) else if /i "%~1"=="--pool" (
+    set BROWSER_POOL=true
+    REM Nombre optionnel de scénarios par navigateur avant recyclage
+    echo %~2| findstr /r "^[0-9][0-9]*$" >nul && (
+        set "BROWSER_POOL_MAX_REUSE=%~2"
+        shift
+    )
 ) else if "%~1"=="--headless" (
     set HEADLESS_MODE=true
 ) else if "%~1"=="--history" (
@@ -49,7 +59,8 @@ REM Choix du répertoire selon WEB_DRIVER
 set "PATH2RESOURCE=%PATH2RESOURCE%;%PATH2RESOURCE%/%WEB_DRIVER%"
 
 REM Construire la commande robot
-set ROBOT_OPTS=--parser GherkinParser ^
+REM   features compilées une seule fois puis chargées depuis WORKSPACE/.feature_cache (lib/CachedGherkinParser.py)
+set ROBOT_OPTS=--parser %cd%\lib\CachedGherkinParser.py ^
   --outputdir %WORKSPACE% ^
   --include %TAG% ^
   --language fr ^
@@ -67,4 +78,9 @@ if "%HISTORY_MODE%"=="true" (
 python ^
   -m robot ^
   %ROBOT_OPTS% ^
-  %cd%\features
\ No newline at end of file
+  %cd%\features
+
+REM Alimenter l'historique des exécutions si HISTORY_MODE est activé (voir run/history.bat)
+if "%HISTORY_MODE%"=="true" (
+    python %cd%\lib\RunHistory.py ingest %WORKSPACE%
+)
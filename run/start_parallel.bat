@@ -0,0 +1,20 @@
+@echo off
+REM Vérifier si un argument a été passé
+if "%1"=="" (
+    echo Usage: start_parallel.bat ^<TAG^> [--workers ^<N^>] [--web ^<selenium^|playwright^|dry-run^>] [--by ^<feature^|scenario^>] [--failing-first] [--headless]
+    echo.
+    echo Examples:
+    echo   start_parallel.bat TNR --workers 4
+    echo   start_parallel.bat regression --workers 8 --web playwright --by scenario --headless
+    echo.
+    exit /b 1
+)
+
+
+cd %cd%
+REM Définit le répertoire de travail (compatible Jenkins)
+REM   chaque worker travaille dans %WORKSPACE%/workers/worker_N, les résultats sont fusionnés dans %WORKSPACE%
+set WORKSPACE=%cd%/run/workspace
+
+REM Exécution parallèle : voir lib/ParallelRunner.py
+python %cd%\lib\ParallelRunner.py %*